@@ -18,14 +18,17 @@ This module implements:
 
 from sqlalchemy import (
     create_engine, Column, String, Integer, Float, Boolean, Text, 
-    DateTime, ForeignKey, UniqueConstraint, CheckConstraint, Index
+    DateTime, ForeignKey, UniqueConstraint, CheckConstraint, Index, text
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship, sessionmaker, Session
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
+import os
+import time
 import uuid
 import bcrypt
 import json
@@ -39,17 +42,68 @@ engine = create_engine(DATABASE_URL, echo=False)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def uuid7() -> uuid.UUID:
+    """Generate a time-ordered UUID (version 7) for primary keys
+    
+    The millisecond timestamp prefix keeps new keys next to each other in the
+    primary key B-tree, unlike random uuid4 values.
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    value = (unix_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = value & ~(0xF << 76) | (0x7 << 76)  # version 7
+    value = value & ~(0x3 << 62) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
 class TimestampMixin:
     """Mixin for adding timestamp columns to models"""
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
+class SoftDeleteMixin:
+    """Mixin for soft deletion - a row is active while deleted_at is NULL"""
+    deleted_at = Column(DateTime(timezone=True))
+    
+    @hybrid_property
+    def is_active(self) -> bool:
+        return self.deleted_at is None
+    
+    @is_active.setter
+    def is_active(self, value: bool) -> None:
+        if value:
+            self.deleted_at = None
+        elif self.deleted_at is None:
+            self.deleted_at = datetime.now(timezone.utc)
+    
+    @is_active.expression
+    def is_active(cls):
+        return cls.deleted_at.is_(None)
+
+
+class PositionMixin:
+    """Mixin for world positions stored as one integer column per axis"""
+    pos_x = Column(Integer, nullable=False, default=0)
+    pos_y = Column(Integer, nullable=False, default=0)
+    pos_z = Column(Integer, nullable=False, default=0)
+    
+    @property
+    def position(self) -> Dict[str, int]:
+        """Position as an {'x', 'y', 'z'} dict"""
+        return {'x': self.pos_x, 'y': self.pos_y, 'z': self.pos_z}
+    
+    @position.setter
+    def position(self, value: Dict[str, int]) -> None:
+        self.pos_x = value.get('x', 0)
+        self.pos_y = value.get('y', 0)
+        self.pos_z = value.get('z', 0)
+
+
 class User(Base, TimestampMixin):
     """User model for authentication and profile management"""
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     username = Column(String(50), unique=True, nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
@@ -65,6 +119,14 @@ class User(Base, TimestampMixin):
     achievements = relationship("UserAchievement", back_populates="user", cascade="all, delete-orphan")
     story_evolutions = relationship("StoryEvolution", back_populates="triggered_by_user")
     
+    # Indexes
+    __table_args__ = (
+        Index('idx_users_username_trgm', username, postgresql_using='gin',
+              postgresql_ops={'username': 'gin_trgm_ops'}),
+        Index('idx_users_email_trgm', email, postgresql_using='gin',
+              postgresql_ops={'email': 'gin_trgm_ops'}),
+    )
+    
     def set_password(self, password: str) -> None:
         """Hash and set user password using bcrypt"""
         password_bytes = password.encode('utf-8')
@@ -92,23 +154,23 @@ class User(Base, TimestampMixin):
         }
 
 
-class UserSession(Base, TimestampMixin):
+class UserSession(Base, TimestampMixin, SoftDeleteMixin):
     """User session management for authentication"""
     __tablename__ = "user_sessions"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     session_token = Column(String(255), unique=True, nullable=False, index=True)
     session_data = Column(JSONB, default=dict)
     expires_at = Column(DateTime(timezone=True), nullable=False)
-    is_active = Column(Boolean, default=True)
     
     # Relationships
     user = relationship("User", back_populates="sessions")
     
     # Indexes
     __table_args__ = (
-        Index('idx_user_sessions_expires', expires_at, postgresql_where=(is_active == True)),
+        Index('idx_user_sessions_expires', expires_at, postgresql_where=text('deleted_at IS NULL')),
+        {'prefixes': ['UNLOGGED']},  # sessions need not survive a server crash
     )
     
     def is_expired(self) -> bool:
@@ -120,7 +182,7 @@ class World(Base, TimestampMixin):
     """World container for game environments"""
     __tablename__ = "worlds"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name = Column(String(100), unique=True, nullable=False)
     description = Column(Text)
     world_settings = Column(JSONB, default=dict)
@@ -162,7 +224,7 @@ class WorldChunk(Base, TimestampMixin):
     """Minecraft-style world chunks for infinite world generation"""
     __tablename__ = "world_chunks"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     world_id = Column(UUID(as_uuid=True), ForeignKey('worlds.id', ondelete='CASCADE'), nullable=False)
     chunk_x = Column(Integer, nullable=False)
     chunk_y = Column(Integer, nullable=False)
@@ -177,10 +239,13 @@ class WorldChunk(Base, TimestampMixin):
     
     # Constraints and Indexes
     __table_args__ = (
-        UniqueConstraint('world_id', 'chunk_x', 'chunk_y', 'chunk_z'),
-        Index('idx_world_chunks_coords', world_id, chunk_x, chunk_y, chunk_z),
-        Index('idx_world_chunks_modified', last_modified),
-        Index('idx_world_chunks_blocks', block_data, postgresql_using='gin'),
+        Index('idx_world_chunks_coords', world_id, chunk_x, chunk_y, chunk_z, unique=True,
+              postgresql_include=['version', 'last_modified']),
+        Index('idx_world_chunks_modified', last_modified, postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}),
+        Index('idx_world_chunks_biome', block_data['biome'].astext),
+        Index('idx_world_chunks_structures', block_data['structures'].label('structures'),
+              postgresql_using='gin', postgresql_ops={'structures': 'jsonb_path_ops'}),
     )
     
     def get_block_at(self, x: int, y: int, z: int) -> Dict[str, Any]:
@@ -198,14 +263,13 @@ class WorldChunk(Base, TimestampMixin):
         self.version += 1
 
 
-class WorldStructure(Base, TimestampMixin):
+class WorldStructure(Base, TimestampMixin, PositionMixin):
     """Persistent structures in the world like buildings, dungeons"""
     __tablename__ = "world_structures"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     world_id = Column(UUID(as_uuid=True), ForeignKey('worlds.id', ondelete='CASCADE'), nullable=False)
     structure_type = Column(String(50), nullable=False)
-    position = Column(JSONB, nullable=False)
     structure_data = Column(JSONB, nullable=False, default=dict)
     created_by_user = Column(UUID(as_uuid=True), ForeignKey('users.id'))
     is_active = Column(Boolean, default=True)
@@ -216,27 +280,25 @@ class WorldStructure(Base, TimestampMixin):
     
     # Indexes
     __table_args__ = (
-        Index('idx_world_structures_position', position, postgresql_using='gin'),
+        Index('idx_world_structures_world_position', 'world_id', 'pos_x', 'pos_y', 'pos_z'),
     )
 
 
-class Character(Base, TimestampMixin):
+class Character(Base, TimestampMixin, PositionMixin, SoftDeleteMixin):
     """Player characters with stats, progression, and inventory"""
     __tablename__ = "characters"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     world_id = Column(UUID(as_uuid=True), ForeignKey('worlds.id', ondelete='CASCADE'), nullable=False)
     name = Column(String(100), nullable=False)
     character_class = Column(String(50), nullable=False)
     stats = Column(JSONB, nullable=False, default=dict)
-    position = Column(JSONB, nullable=False, default={'x': 0, 'y': 0, 'z': 0})
     inventory = Column(JSONB, default=dict)
     skills = Column(JSONB, default=dict)
     level = Column(Integer, default=1)
     experience = Column(Integer, default=0)
     last_active = Column(DateTime(timezone=True), server_default=func.now())
-    is_active = Column(Boolean, default=True)
     
     # Relationships
     user = relationship("User", back_populates="characters")
@@ -254,24 +316,34 @@ class Character(Base, TimestampMixin):
     
     # Indexes
     __table_args__ = (
-        Index('idx_characters_world', world_id, postgresql_where=(is_active == True)),
-        Index('idx_characters_user', user_id, postgresql_where=(is_active == True)),
-        Index('idx_characters_position', position, postgresql_using='gin'),
-        Index('idx_characters_position_x', func.cast(position['x'], Integer)),
-        Index('idx_characters_position_y', func.cast(position['y'], Integer)),
-        Index('idx_characters_position_z', func.cast(position['z'], Integer)),
+        Index('idx_characters_world', world_id, postgresql_where=text('deleted_at IS NULL')),
+        Index('idx_characters_user', user_id, postgresql_where=text('deleted_at IS NULL')),
+        Index('idx_characters_world_position', 'world_id', 'pos_x', 'pos_y', 'pos_z'),
+        Index('idx_characters_name_trgm', name, postgresql_using='gin',
+              postgresql_ops={'name': 'gin_trgm_ops'}),
     )
+    # Bounding-box lookups go through the generated position_geom column and its
+    # SP-GiST index, both managed by the migrations (PostGIS)
     
     def get_position_tuple(self) -> tuple:
         """Get position as tuple (x, y, z)"""
-        pos = self.position or {'x': 0, 'y': 0, 'z': 0}
-        return (pos['x'], pos['y'], pos['z'])
+        return (self.pos_x, self.pos_y, self.pos_z)
     
     def set_position(self, x: int, y: int, z: int) -> None:
         """Set character position"""
-        self.position = {'x': x, 'y': y, 'z': z}
+        self.pos_x, self.pos_y, self.pos_z = x, y, z
         self.last_active = datetime.now(timezone.utc)
     
+    @classmethod
+    def find_in_box(cls, db: Session, world_id, low: tuple, high: tuple) -> List['Character']:
+        """Find active characters whose position lies inside a 3D bounding box"""
+        box = func.ST_3DMakeBox(func.ST_MakePoint(*low), func.ST_MakePoint(*high))
+        return db.query(cls).filter(
+            cls.world_id == world_id,
+            cls.is_active,
+            literal_column('characters.position_geom').op('&/&')(box)
+        ).all()
+    
     def add_experience(self, amount: int) -> bool:
         """Add experience and handle level ups"""
         self.experience += amount
@@ -303,66 +375,87 @@ class CharacterRelationship(Base, TimestampMixin):
     """Relationships and social dynamics between characters"""
     __tablename__ = "character_relationships"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     character_id = Column(UUID(as_uuid=True), ForeignKey('characters.id', ondelete='CASCADE'), nullable=False)
     target_character_id = Column(UUID(as_uuid=True), ForeignKey('characters.id', ondelete='CASCADE'), nullable=False)
     relationship_type = Column(String(50), nullable=False)  # friend, enemy, neutral, romantic, rival
     affinity_score = Column(Float, default=0.0)  # -100.0 to +100.0
-    interaction_history = Column(JSONB, default=list)
     
     # Relationships
     character = relationship("Character", foreign_keys=[character_id], back_populates="relationships")
     target_character = relationship("Character", foreign_keys=[target_character_id], back_populates="target_relationships")
+    # Write-only: appending inserts one row without loading the existing history
+    interactions = relationship("CharacterInteraction", back_populates="character_relationship",
+                                lazy="write_only", cascade="all, delete-orphan", passive_deletes=True)
     
     # Constraints and Indexes
     __table_args__ = (
         UniqueConstraint('character_id', 'target_character_id'),
         CheckConstraint('character_id != target_character_id'),
         CheckConstraint('affinity_score >= -100.0 AND affinity_score <= 100.0'),
-        Index('idx_character_relationships_character', character_id),
-        Index('idx_character_relationships_target', target_character_id),
+        Index('idx_character_relationships_target', target_character_id, character_id,
+              postgresql_include=['affinity_score']),
     )
     
     def add_interaction(self, interaction_type: str, details: Dict[str, Any]) -> None:
-        """Add an interaction to the history"""
-        interaction = {
-            'type': interaction_type,
-            'details': details,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+        """Record an interaction in the history"""
+        self.interactions.add(CharacterInteraction(kind=interaction_type, payload=details))
+    
+    def recent_interactions(self, db: Session, limit: int = 50) -> List["CharacterInteraction"]:
+        """Get the most recent interactions, newest first"""
+        query = self.interactions.select().order_by(CharacterInteraction.occurred_at.desc()).limit(limit)
+        return db.scalars(query).all()
+
+
+class CharacterInteraction(Base):
+    """A single interaction between two related characters"""
+    __tablename__ = "character_interactions"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    relationship_id = Column(UUID(as_uuid=True), ForeignKey('character_relationships.id', ondelete='CASCADE'), nullable=False)
+    occurred_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    kind = Column(String(50))
+    payload = Column(JSONB, default=dict)
+    
+    # Relationships
+    character_relationship = relationship("CharacterRelationship", back_populates="interactions")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_character_interactions_relationship', relationship_id, occurred_at.desc()),
+    )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for API responses"""
+        return {
+            'type': self.kind,
+            'details': self.payload,
+            'timestamp': self.occurred_at.isoformat() if self.occurred_at else None
         }
-        
-        if not isinstance(self.interaction_history, list):
-            self.interaction_history = []
-        
-        self.interaction_history.append(interaction)
-        
-        # Keep only last 50 interactions
-        if len(self.interaction_history) > 50:
-            self.interaction_history = self.interaction_history[-50:]
 
 
-class NPC(Base, TimestampMixin):
+class NPC(Base, TimestampMixin, PositionMixin, SoftDeleteMixin):
     """AI-powered non-player characters"""
     __tablename__ = "npcs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     world_id = Column(UUID(as_uuid=True), ForeignKey('worlds.id', ondelete='CASCADE'), nullable=False)
     name = Column(String(100), nullable=False)
     npc_type = Column(String(50), nullable=False)  # merchant, guard, sage, quest_giver, etc.
     personality = Column(JSONB, nullable=False, default=dict)
-    position = Column(JSONB, nullable=False, default={'x': 0, 'y': 0, 'z': 0})
     dialogue_tree = Column(JSONB, default=dict)
     ai_memory = Column(JSONB, default=dict)  # AI agent memory for this NPC
     last_interaction = Column(DateTime(timezone=True))
-    is_active = Column(Boolean, default=True)
     
     # Relationships
     world = relationship("World", back_populates="npcs")
     
     # Indexes
     __table_args__ = (
-        Index('idx_npcs_world', world_id, postgresql_where=(is_active == True)),
-        Index('idx_npcs_personality', personality, postgresql_using='gin'),
+        Index('idx_npcs_world', world_id, postgresql_where=text('deleted_at IS NULL')),
+        Index('idx_npcs_world_position', 'world_id', 'pos_x', 'pos_y', 'pos_z'),
+        Index('idx_npcs_personality', personality, postgresql_using='gin',
+              postgresql_ops={'personality': 'jsonb_path_ops'}),
     )
     
     def interact_with_character(self, character: Character, message: str) -> Dict[str, Any]:
@@ -396,11 +489,11 @@ class NPC(Base, TimestampMixin):
         }
 
 
-class Story(Base, TimestampMixin):
+class Story(Base, TimestampMixin, SoftDeleteMixin):
     """Dynamic narrative threads that evolve with player choices"""
     __tablename__ = "stories"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     world_id = Column(UUID(as_uuid=True), ForeignKey('worlds.id', ondelete='CASCADE'), nullable=False)
     title = Column(String(200), nullable=False)
     description = Column(Text)
@@ -409,7 +502,6 @@ class Story(Base, TimestampMixin):
     branching_data = Column(JSONB, default=dict)
     priority = Column(Integer, default=0)
     last_evolved = Column(DateTime(timezone=True), server_default=func.now())
-    is_active = Column(Boolean, default=True)
     
     # Relationships
     world = relationship("World", back_populates="stories")
@@ -419,8 +511,9 @@ class Story(Base, TimestampMixin):
     
     # Indexes
     __table_args__ = (
-        Index('idx_stories_world', world_id, postgresql_where=(is_active == True)),
-        Index('idx_stories_narrative_threads', narrative_threads, postgresql_using='gin'),
+        Index('idx_stories_world', world_id, postgresql_where=text('deleted_at IS NULL')),
+        Index('idx_stories_narrative_threads', narrative_threads, postgresql_using='gin',
+              postgresql_ops={'narrative_threads': 'jsonb_path_ops'}),
     )
     
     def create_branch(self, branch_name: str, branch_data: Dict[str, Any]) -> None:
@@ -441,7 +534,7 @@ class StoryChoice(Base):
     """Player choices that affect story progression"""
     __tablename__ = "story_choices"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     story_id = Column(UUID(as_uuid=True), ForeignKey('stories.id', ondelete='CASCADE'), nullable=False)
     character_id = Column(UUID(as_uuid=True), ForeignKey('characters.id', ondelete='CASCADE'), nullable=False)
     choice_text = Column(Text, nullable=False)
@@ -458,7 +551,8 @@ class StoryChoice(Base):
     __table_args__ = (
         Index('idx_story_choices_story', story_id),
         Index('idx_story_choices_character', character_id),
-        Index('idx_story_choices_consequences', consequences, postgresql_using='gin'),
+        Index('idx_story_choices_consequences', consequences, postgresql_using='gin',
+              postgresql_ops={'consequences': 'jsonb_path_ops'}),
     )
 
 
@@ -466,7 +560,7 @@ class StoryEvolution(Base):
     """Tracks how stories evolve through AI and player actions"""
     __tablename__ = "story_evolution"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     story_id = Column(UUID(as_uuid=True), ForeignKey('stories.id', ondelete='CASCADE'), nullable=False)
     triggered_by_user = Column(UUID(as_uuid=True), ForeignKey('users.id'))
     evolution_type = Column(String(50), nullable=False)  # player_choice, ai_evolution, world_event
@@ -484,7 +578,7 @@ class Quest(Base, TimestampMixin):
     """Dynamic quests generated by AI and player actions"""
     __tablename__ = "quests"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     world_id = Column(UUID(as_uuid=True), ForeignKey('worlds.id', ondelete='CASCADE'), nullable=False)
     story_id = Column(UUID(as_uuid=True), ForeignKey('stories.id'))
     title = Column(String(200), nullable=False)
@@ -512,9 +606,8 @@ class QuestProgress(Base, TimestampMixin):
     """Individual character progress on quests"""
     __tablename__ = "quest_progress"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    quest_id = Column(UUID(as_uuid=True), ForeignKey('quests.id', ondelete='CASCADE'), nullable=False)
-    character_id = Column(UUID(as_uuid=True), ForeignKey('characters.id', ondelete='CASCADE'), nullable=False)
+    quest_id = Column(UUID(as_uuid=True), ForeignKey('quests.id', ondelete='CASCADE'), primary_key=True)
+    character_id = Column(UUID(as_uuid=True), ForeignKey('characters.id', ondelete='CASCADE'), primary_key=True)
     progress_data = Column(JSONB, default=dict)
     status = Column(String(20), default='not_started')  # not_started, active, completed, failed
     started_at = Column(DateTime(timezone=True))
@@ -524,9 +617,8 @@ class QuestProgress(Base, TimestampMixin):
     quest = relationship("Quest", back_populates="progress_records")
     character = relationship("Character", back_populates="quest_progress")
     
-    # Constraints and Indexes
+    # Indexes - the (quest_id, character_id) primary key covers quest lookups
     __table_args__ = (
-        UniqueConstraint('quest_id', 'character_id'),
         Index('idx_quest_progress_character', character_id),
     )
 
@@ -535,7 +627,7 @@ class AIAgent(Base, TimestampMixin):
     """AI agents that manage various aspects of the game"""
     __tablename__ = "ai_agents"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     agent_name = Column(String(100), unique=True, nullable=False)
     agent_type = Column(String(50), nullable=False)  # story_generator, world_builder, npc_controller, etc.
     configuration = Column(JSONB, nullable=False, default=dict)
@@ -550,7 +642,8 @@ class AIAgent(Base, TimestampMixin):
     # Indexes
     __table_args__ = (
         Index('idx_ai_agents_type', agent_type, postgresql_where=(is_enabled == True)),
-        Index('idx_ai_agents_config', configuration, postgresql_using='gin'),
+        Index('idx_ai_agents_config', configuration, postgresql_using='gin',
+              postgresql_ops={'configuration': 'jsonb_path_ops'}),
     )
 
 
@@ -558,13 +651,14 @@ class AIAgentActivity(Base):
     """Log of AI agent activities for monitoring and debugging"""
     __tablename__ = "ai_agent_activities"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     agent_id = Column(UUID(as_uuid=True), ForeignKey('ai_agents.id', ondelete='CASCADE'), nullable=False)
     world_id = Column(UUID(as_uuid=True), ForeignKey('worlds.id', ondelete='CASCADE'))
     activity_type = Column(String(50), nullable=False)
     activity_data = Column(JSONB, default=dict)
     results = Column(JSONB, default=dict)
-    executed_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Partition key (monthly ranges, see migration 009), so part of the primary key
+    executed_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     execution_time_ms = Column(Float)
     
     # Relationships
@@ -575,7 +669,9 @@ class AIAgentActivity(Base):
     __table_args__ = (
         Index('idx_ai_activities_agent', agent_id),
         Index('idx_ai_activities_world', world_id),
-        Index('idx_ai_activities_executed', executed_at),
+        Index('idx_ai_activities_executed', executed_at, postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}),
+        {'prefixes': ['UNLOGGED']},  # telemetry, truncated after a server crash
     )
 
 
@@ -583,7 +679,7 @@ class WorldEvent(Base, TimestampMixin):
     """World events including seasonal changes and emergent events"""
     __tablename__ = "world_events"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     world_id = Column(UUID(as_uuid=True), ForeignKey('worlds.id', ondelete='CASCADE'), nullable=False)
     event_type = Column(String(50), nullable=False)  # seasonal, emergency, celebration, disaster
     title = Column(String(200), nullable=False)
@@ -593,6 +689,8 @@ class WorldEvent(Base, TimestampMixin):
     executed_at = Column(DateTime(timezone=True))
     status = Column(String(20), default='scheduled')  # scheduled, active, completed, cancelled
     is_seasonal = Column(Boolean, default=False)
+    # Partition key (monthly ranges, see migration 009), so part of the primary key
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     
     # Relationships
     world = relationship("World", back_populates="events")
@@ -608,13 +706,14 @@ class WorldEvolutionLog(Base):
     """Comprehensive log of world evolution by AI agents"""
     __tablename__ = "world_evolution_log"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     world_id = Column(UUID(as_uuid=True), ForeignKey('worlds.id', ondelete='CASCADE'), nullable=False)
     agent_id = Column(UUID(as_uuid=True), ForeignKey('ai_agents.id'), nullable=False)
     evolution_type = Column(String(50), nullable=False)  # terrain_change, structure_added, story_evolution
     changes_made = Column(JSONB, nullable=False)
     ai_reasoning = Column(Text)
-    executed_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Partition key (monthly ranges, see migration 009), so part of the primary key
+    executed_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     impact_score = Column(Float, default=0.0)  # Measure of change magnitude
     
     # Relationships
@@ -624,7 +723,8 @@ class WorldEvolutionLog(Base):
     # Indexes
     __table_args__ = (
         Index('idx_world_evolution_world', world_id),
-        Index('idx_world_evolution_executed', executed_at),
+        Index('idx_world_evolution_executed', executed_at, postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}),
         Index('idx_world_evolution_impact', impact_score),
     )
 
@@ -633,7 +733,7 @@ class UserAchievement(Base):
     """Player achievements and progression milestones"""
     __tablename__ = "user_achievements"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     achievement_type = Column(String(50), nullable=False)  # exploration, combat, social, building, story
     title = Column(String(200), nullable=False)
@@ -656,7 +756,7 @@ class InventoryItem(Base, TimestampMixin):
     """Character inventory items with stacking support"""
     __tablename__ = "inventory_items"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     character_id = Column(UUID(as_uuid=True), ForeignKey('characters.id', ondelete='CASCADE'), nullable=False)
     item_type = Column(String(50), nullable=False)  # weapon, armor, consumable, material, tool
     item_name = Column(String(100), nullable=False)
@@ -688,7 +788,7 @@ class CraftingRecipe(Base, TimestampMixin):
     """Available crafting recipes"""
     __tablename__ = "crafting_recipes"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     recipe_name = Column(String(100), unique=True, nullable=False)
     ingredients = Column(JSONB, nullable=False)  # Required materials and quantities
     result_item = Column(JSONB, nullable=False)  # Item created by recipe
@@ -9,12 +9,81 @@ Three AI agents work together to create an amazing adventure:
 - Adventure Helper: Gives hints and encouragement
 """
 
-from crewai import Agent, Task, Crew, Process
+from crewai import Agent, Task
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import logging
 import os
 import random
-from typing import Dict, List
+import re
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Player input handling
+_VALID_CHOICES = frozenset("123")
+_CHOICE_RE = re.compile(r"[123]")
+_QUIT_WORDS = frozenset({"quit", "q", "exit"})
+
+# Racers in fastest_playthrough spread their sampling temperatures across this
+# range so they don't all repeat the same completions
+RACE_TEMPERATURE_RANGE = (0.5, 1.0)
+
+# Shared by every game: once a round's story is written, its choices and hint
+# tasks run here side by side
+_ROUND_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="round")
+
+# Task prompt templates, filled in per turn with str.format
+OPENING_STORY_TEMPLATE = """Create the opening of a magical adventure for a 10-year-old named {name}. 
+                Set the scene in an Enchanted Forest with:
+                - A magical, welcoming atmosphere
+                - An interesting quest or mystery to solve
+                - Friendly magical creatures they might meet
+                - A clear, simple goal
+                Keep it exciting but not scary. Make it 3-4 sentences."""
+
+OPENING_CHOICES_TEMPLATE = """Based on the story opening, present {name} with 3 simple, fun choices for what to do first. 
+                Make sure each choice:
+                - Sounds adventurous and fun
+                - Is appropriate for a 10-year-old  
+                - Could lead to something interesting
+                - Is clearly numbered (1, 2, 3)
+                Format: Present the choices clearly with numbers."""
+
+CONTINUE_STORY_TEMPLATE = """Continue the adventure story based on {name}'s choice: "{player_input}"
+                Current situation: {context}
+                
+                Create what happens next:
+                - Make their choice lead to something exciting
+                - Include friendly characters or magical discoveries
+                - Keep it positive and fun
+                - 2-3 sentences describing the outcome"""
+
+CONTINUE_CHOICES_TEMPLATE = """Based on the new story development, give {name} 3 new choices for what to do next.
+                Consider their current situation: {context}
+                
+                Make each choice:
+                - Lead to different types of adventures
+                - Be appropriate and fun for kids
+                - Be clearly numbered (1, 2, 3)"""
+
+HINT_TEMPLATE = """Provide a helpful hint or encouraging message for {name}.
+            Current situation: {context}
+            
+            Give them:
+            - A gentle hint about what each choice might lead to
+            - Encouragement about their adventure
+            - Remind them they're doing great
+            Keep it short and positive!"""
 
 class MagicAdventureGame:
+    # The agents hold no per-game state, so every game shares one crew
+    _crew_singleton: Optional[Tuple[Agent, Agent, Agent]] = None
+    _crew_lock = threading.Lock()
+
     def __init__(self):
         self.player_name = ""
         self.player_health = 100
@@ -40,8 +109,44 @@ class MagicAdventureGame:
             self.player_name = "Brave Explorer"
         print(f"\nWelcome, {self.player_name}! Your adventure begins...")
 
-    def create_story_crew(self) -> Crew:
-        """Create the AI crew that will run the game"""
+    def _typewriter(self, text: str, cps: int = 80):
+        """Write text a character at a time for a storybook feel"""
+        if os.environ.get("MAG_FAST"):
+            cps = 10_000  # Automated runs shouldn't wait on the effect
+        delay = 1 / cps
+        for ch in text:
+            sys.stdout.write(ch)
+            sys.stdout.flush()
+            time.sleep(delay)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+    @staticmethod
+    def ai_enabled() -> bool:
+        """Whether rounds are played by the AI crew rather than simulated"""
+        return bool(os.getenv("OPENAI_API_KEY"))
+
+    @classmethod
+    def create_story_crew(cls) -> Tuple[Agent, Agent, Agent]:
+        """Create the AI crew that will run the game (built once, then shared)"""
+        if cls._crew_singleton is None:
+            # Games may start on several threads at once; only one builds the crew
+            with cls._crew_lock:
+                if cls._crew_singleton is None:
+                    cls._crew_singleton = cls.build_agents()
+        return cls._crew_singleton
+
+    @staticmethod
+    def build_agents(temperature: Optional[float] = None) -> Tuple[Agent, Agent, Agent]:
+        """Build a fresh story creator, game master and helper
+        
+        With a temperature the agents get their own model client sampling at
+        it; otherwise they use CrewAI's default.
+        """
+        llm_kwargs = {}
+        if temperature is not None:
+            from langchain_openai import ChatOpenAI
+            llm_kwargs["llm"] = ChatOpenAI(temperature=temperature)
         
         # Story Creator - Builds the world and scenarios
         story_creator = Agent(
@@ -49,7 +154,8 @@ class MagicAdventureGame:
             goal="Create exciting, age-appropriate adventures for young heroes",
             backstory="You're a wise storyteller who has seen countless magical realms. You love creating fun, safe adventures that spark imagination and teach good values. You always include friendly characters, magical creatures, and positive choices.",
             verbose=False,
-            allow_delegation=False
+            allow_delegation=False,
+            **llm_kwargs
         )
         
         # Game Master - Manages gameplay and responds to choices  
@@ -58,7 +164,8 @@ class MagicAdventureGame:
             goal="Guide players through exciting choices and manage the game flow",
             backstory="You're a friendly guide who helps young adventurers navigate their quests. You present clear choices, celebrate good decisions, and always keep things fun and encouraging. You never let players get truly stuck or scared.",
             verbose=False,
-            allow_delegation=False
+            allow_delegation=False,
+            **llm_kwargs
         )
         
         # Helper - Provides hints and encouragement
@@ -67,7 +174,8 @@ class MagicAdventureGame:
             goal="Provide helpful hints and encouragement to young adventurers",
             backstory="You're a cheerful companion spirit who believes every child can be a hero. You offer gentle guidance, celebrate victories, and help when things get challenging. You're always positive and supportive.",
             verbose=False,
-            allow_delegation=False
+            allow_delegation=False,
+            **llm_kwargs
         )
         
         return story_creator, game_master, adventure_helper
@@ -75,101 +183,89 @@ class MagicAdventureGame:
     def create_game_tasks(self, story_creator, game_master, adventure_helper, player_input: str = "") -> List[Task]:
         """Create tasks for the current game situation"""
         
-        context = f"""
-        Player Name: {self.player_name}
-        Current Location: {self.current_location}
-        Health: {self.player_health}/100
-        Items: {', '.join(self.player_items) if self.player_items else 'None'}
-        Game State: {self.game_state}
-        Player Input: {player_input}
-        """
+        context = "\n".join([
+            f"Player Name: {self.player_name}",
+            f"Current Location: {self.current_location}",
+            f"Health: {self.player_health}/100",
+            f"Items: {', '.join(self.player_items) or 'None'}",
+            f"Game State: {self.game_state}",
+            f"Player Input: {player_input}",
+        ])
         
         if self.game_state == "beginning":
             # Starting the adventure
             story_task = Task(
-                description=f"""Create the opening of a magical adventure for a 10-year-old named {self.player_name}. 
-                Set the scene in an Enchanted Forest with:
-                - A magical, welcoming atmosphere
-                - An interesting quest or mystery to solve
-                - Friendly magical creatures they might meet
-                - A clear, simple goal
-                Keep it exciting but not scary. Make it 3-4 sentences.""",
+                description=OPENING_STORY_TEMPLATE.format(name=self.player_name),
                 expected_output="An engaging opening scene that sets up the adventure",
                 agent=story_creator
             )
             
             choice_task = Task(
-                description=f"""Based on the story opening, present {self.player_name} with 3 simple, fun choices for what to do first. 
-                Make sure each choice:
-                - Sounds adventurous and fun
-                - Is appropriate for a 10-year-old  
-                - Could lead to something interesting
-                - Is clearly numbered (1, 2, 3)
-                Format: Present the choices clearly with numbers.""",
+                description=OPENING_CHOICES_TEMPLATE.format(name=self.player_name),
                 expected_output="Three numbered adventure choices",
-                agent=game_master
+                agent=game_master,
+                context=[story_task]
             )
             
         else:
             # Responding to player choice
             story_task = Task(
-                description=f"""Continue the adventure story based on {self.player_name}'s choice: "{player_input}"
-                Current situation: {context}
-                
-                Create what happens next:
-                - Make their choice lead to something exciting
-                - Include friendly characters or magical discoveries
-                - Keep it positive and fun
-                - 2-3 sentences describing the outcome""",
+                description=CONTINUE_STORY_TEMPLATE.format(
+                    name=self.player_name, player_input=player_input, context=context
+                ),
                 expected_output="A continuation of the adventure based on the player's choice",
                 agent=story_creator
             )
             
             choice_task = Task(
-                description=f"""Based on the new story development, give {self.player_name} 3 new choices for what to do next.
-                Consider their current situation: {context}
-                
-                Make each choice:
-                - Lead to different types of adventures
-                - Be appropriate and fun for kids
-                - Be clearly numbered (1, 2, 3)""",
+                description=CONTINUE_CHOICES_TEMPLATE.format(name=self.player_name, context=context),
                 expected_output="Three new numbered choices for continuing the adventure",
-                agent=game_master
+                agent=game_master,
+                context=[story_task]
             )
         
         hint_task = Task(
-            description=f"""Provide a helpful hint or encouraging message for {self.player_name}.
-            Current situation: {context}
-            
-            Give them:
-            - A gentle hint about what each choice might lead to
-            - Encouragement about their adventure
-            - Remind them they're doing great
-            Keep it short and positive!""",
+            description=HINT_TEMPLATE.format(name=self.player_name, context=context),
             expected_output="An encouraging hint or tip",
-            agent=adventure_helper
+            agent=adventure_helper,
+            context=[story_task]
         )
         
         return [story_task, choice_task, hint_task]
 
-    def run_game_round(self, story_creator, game_master, adventure_helper, player_input: str = ""):
-        """Run one round of the game"""
+    def run_game_round(self, story_creator, game_master, adventure_helper, player_input: str = "",
+                       fallback: bool = True):
+        """Run one round of the game
+        
+        With fallback off, a missing API key or failed AI call raises instead
+        of returning simulated responses.
+        """
         
         tasks = self.create_game_tasks(story_creator, game_master, adventure_helper, player_input)
         
-        crew = Crew(
-            agents=[story_creator, game_master, adventure_helper],
-            tasks=tasks,
-            process=Process.sequential,
-            verbose=False
-        )
+        if not self.ai_enabled():
+            if not fallback:
+                raise RuntimeError("OPENAI_API_KEY is not set; the AI crew can't run")
+            # Without an API key the AI crew can't run, so simulate the responses
+            return self.simulate_ai_responses(player_input)
         
+        story_task, choice_task, hint_task = tasks
         try:
-            # This would normally run the AI crew, but without API keys it will fail
-            # For demo purposes, we'll simulate the responses
-            return self.simulate_ai_responses(player_input)
-        except Exception as e:
+            # Choices and hint both build on the story, so it is written first;
+            # the two follow-ups then run side by side with it as context
+            story = story_task.execute_sync().raw
+            futures = [_ROUND_POOL.submit(task.execute_sync, context=story)
+                       for task in (choice_task, hint_task)]
+            choices, hint = (future.result().raw for future in futures)
+        except Exception:
+            if not fallback:
+                raise
+            logger.warning("AI round failed, falling back to simulated responses", exc_info=True)
             return self.simulate_ai_responses(player_input)
+        
+        if self.game_state == "beginning":
+            self.game_state = "exploring"
+        return {"story": story, "choices": choices, "hint": hint}
     
     def simulate_ai_responses(self, player_input: str = "") -> Dict[str, str]:
         """Simulate AI responses for demo without API keys"""
@@ -205,10 +301,10 @@ class MagicAdventureGame:
         if self.game_state == "beginning":
             adventure = adventures[0]
             self.game_state = "exploring"
-        elif len(player_input) > 0 and "1" in player_input:
-            adventure = adventures[1] 
         else:
-            adventure = adventures[2]
+            match = _CHOICE_RE.search(player_input)
+            choice_key = match.group() if match else None
+            adventure = adventures[1] if choice_key == "1" else adventures[2]
             
         return {
             "story": adventure["story"],
@@ -216,6 +312,30 @@ class MagicAdventureGame:
             "hint": adventure["hint"]
         }
 
+    def play_scripted(self, choices=("1", "1", "2"), player_name: str = "Brave Explorer",
+                      agents: Optional[Tuple[Agent, Agent, Agent]] = None,
+                      stop: Optional[threading.Event] = None, fallback: bool = True) -> Dict:
+        """Play a whole game without input and return the transcript
+        
+        Uses the shared crew unless agents are given. Setting stop ends the
+        game before its next round. With fallback off, any round the AI crew
+        can't play raises instead of being simulated.
+        """
+        self.player_name = player_name
+        crew = agents or self.create_story_crew()
+        
+        turns = [self.run_game_round(*crew, fallback=fallback)]
+        for choice in choices:
+            if stop is not None and stop.is_set():
+                break
+            turns.append(self.run_game_round(*crew, choice, fallback=fallback))
+        
+        return {"player_name": self.player_name, "choices": list(choices), "turns": turns}
+
+    async def _aplay_game(self, choices=("1", "1", "2"), **kwargs) -> Dict:
+        """Run play_scripted off the event loop"""
+        return await asyncio.to_thread(self.play_scripted, choices, **kwargs)
+
     def play_game(self):
         """Main game loop"""
         self.display_header()
@@ -241,20 +361,23 @@ class MagicAdventureGame:
                 print(f"\n{self.player_name}, what do you choose?")
                 choice = input("Enter 1, 2, or 3 (or 'quit' to end): ").strip().lower()
                 
-                if choice == 'quit':
+                if choice in _QUIT_WORDS:
                     break
+                if choice not in _VALID_CHOICES:
+                    print("🤔 Oops! Please pick 1, 2, or 3.")
+                    continue
                     
                 responses = self.run_game_round(story_creator, game_master, adventure_helper, choice)
             
             # Display the responses
             print(f"\n📚 Story Weaver says:")
-            print(responses["story"])
+            self._typewriter(responses["story"])
             
             print(f"\n🎲 Game Master presents your choices:")
-            print(responses["choices"])
+            self._typewriter(responses["choices"])
             
             print(f"\n💫 Helper Spirit whispers:")
-            print(responses["hint"])
+            self._typewriter(responses["hint"])
             
             turn_count += 1
         
@@ -262,11 +385,50 @@ class MagicAdventureGame:
         print("🎉 You are a true hero! The adventure continues in your imagination...")
         print("💝 Remember: You can be brave, kind, and magical every day!")
 
+async def fastest_playthrough(k: int = 3, choices=("1", "1", "2")) -> Dict:
+    """Race k scripted games and keep the first the AI crew plays to the end (for demo transcripts)
+    
+    Racers never fall back to simulated rounds, so a simulated transcript
+    can't win; if every racer fails the last error is raised.
+    """
+    if k < 1:
+        raise ValueError(f"k must be at least 1, got {k}")
+    
+    stop = threading.Event()
+    low, high = RACE_TEMPERATURE_RANGE
+    # Each racer runs on its own thread, so each gets its own agents, sampling
+    # at its own temperature so the racers produce different games
+    pending = {
+        asyncio.create_task(MagicAdventureGame()._aplay_game(
+            choices, stop=stop, fallback=False,
+            agents=MagicAdventureGame.build_agents(low + (high - low) * i / max(k - 1, 1)),
+        ))
+        for i in range(k)
+    }
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        # Cancelling doesn't stop a worker thread; stop makes the losers
+        # quit before their next round
+        stop.set()
+        for task in pending:
+            task.cancel()
+
 def main():
     """Start the Magic Adventure Game"""
     print("🎮 Initializing Magic Adventure Game...")
-    print("📝 Note: This game works best with OpenAI API key in .env file")
-    print("🎭 Running in demo mode with simulated responses...")
+    if MagicAdventureGame.ai_enabled():
+        print("🤖 AI companions connected - your adventure will be written live!")
+    else:
+        print("📝 Note: This game works best with OpenAI API key in .env file")
+        print("🎭 Running in demo mode with simulated responses...")
     
     game = MagicAdventureGame()
     game.play_game()
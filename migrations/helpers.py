@@ -0,0 +1,48 @@
+"""
+Shared helpers for Alembic migrations
+
+Adding a CHECK or FOREIGN KEY constraint in one statement holds an
+ACCESS EXCLUSIVE lock while every existing row is checked. On a populated
+table that blocks reads and writes for the whole scan. These helpers split
+the work in two:
+
+1. ADD CONSTRAINT ... NOT VALID is a catalog-only change. Only new and
+   updated rows are checked.
+2. VALIDATE CONSTRAINT scans the existing rows under SHARE UPDATE EXCLUSIVE,
+   so normal traffic keeps running.
+
+The ADD's ACCESS EXCLUSIVE lock lasts until its transaction commits, so the
+VALIDATE runs in an autocommit block. Entering the block commits the
+migration's transaction up to that point, releasing the lock before the scan.
+
+Import from a revision with:
+    from migrations.helpers import add_check_online
+"""
+
+from typing import List, Optional
+
+from alembic import op
+
+
+def _validate_constraint(table: str, name: str) -> None:
+    """Validate a NOT VALID constraint after committing the ADD"""
+    with op.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+
+def add_check_online(table: str, name: str, expr: str) -> None:
+    """Add a CHECK constraint without blocking writes while existing rows are validated"""
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} CHECK ({expr}) NOT VALID")
+    _validate_constraint(table, name)
+
+
+def add_foreign_key_online(table: str, name: str, columns: List[str], referent: str,
+                           referent_columns: Optional[List[str]] = None,
+                           ondelete: Optional[str] = None) -> None:
+    """Add a FOREIGN KEY constraint without blocking writes while existing rows are validated"""
+    referent_columns = referent_columns or ['id']
+    on_delete = f" ON DELETE {ondelete}" if ondelete else ""
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} "
+               f"FOREIGN KEY ({', '.join(columns)}) "
+               f"REFERENCES {referent} ({', '.join(referent_columns)}){on_delete} NOT VALID")
+    _validate_constraint(table, name)
@@ -8,6 +8,7 @@ Create Date: 2025-09-04 22:23:00.000000
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
 
 
 # revision identifiers, used by Alembic.
@@ -18,12 +19,12 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Enable UUID extension
-    op.execute('CREATE EXTENSION IF NOT EXISTS "pgcrypto"')
+    # Tables are declared here and emitted as one DDL batch at the end
+    metadata = sa.MetaData()
     
     # Create users table
-    op.create_table(
-        'users',
+    sa.Table(
+        'users', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('username', sa.String(50), nullable=False),
         sa.Column('email', sa.String(255), nullable=False),
@@ -41,8 +42,8 @@ def upgrade() -> None:
     )
     
     # Create user_sessions table
-    op.create_table(
-        'user_sessions',
+    sa.Table(
+        'user_sessions', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('user_id', postgresql.UUID(), nullable=False),
         sa.Column('session_token', sa.String(255), nullable=False),
@@ -57,8 +58,8 @@ def upgrade() -> None:
     )
     
     # Create worlds table
-    op.create_table(
-        'worlds',
+    sa.Table(
+        'worlds', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('name', sa.String(100), nullable=False),
         sa.Column('description', sa.Text()),
@@ -73,8 +74,8 @@ def upgrade() -> None:
     )
     
     # Create world_chunks table
-    op.create_table(
-        'world_chunks',
+    sa.Table(
+        'world_chunks', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('world_id', postgresql.UUID(), nullable=False),
         sa.Column('chunk_x', sa.Integer(), nullable=False),
@@ -92,8 +93,8 @@ def upgrade() -> None:
     )
     
     # Create world_structures table
-    op.create_table(
-        'world_structures',
+    sa.Table(
+        'world_structures', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('world_id', postgresql.UUID(), nullable=False),
         sa.Column('structure_type', sa.String(50), nullable=False),
@@ -109,8 +110,8 @@ def upgrade() -> None:
     )
     
     # Create characters table
-    op.create_table(
-        'characters',
+    sa.Table(
+        'characters', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('user_id', postgresql.UUID(), nullable=False),
         sa.Column('world_id', postgresql.UUID(), nullable=False),
@@ -132,8 +133,8 @@ def upgrade() -> None:
     )
     
     # Create character_relationships table
-    op.create_table(
-        'character_relationships',
+    sa.Table(
+        'character_relationships', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('character_id', postgresql.UUID(), nullable=False),
         sa.Column('target_character_id', postgresql.UUID(), nullable=False),
@@ -151,8 +152,8 @@ def upgrade() -> None:
     )
     
     # Create npcs table
-    op.create_table(
-        'npcs',
+    sa.Table(
+        'npcs', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('world_id', postgresql.UUID(), nullable=False),
         sa.Column('name', sa.String(100), nullable=False),
@@ -170,8 +171,8 @@ def upgrade() -> None:
     )
     
     # Create stories table
-    op.create_table(
-        'stories',
+    sa.Table(
+        'stories', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('world_id', postgresql.UUID(), nullable=False),
         sa.Column('title', sa.String(200), nullable=False),
@@ -189,8 +190,8 @@ def upgrade() -> None:
     )
     
     # Create ai_agents table
-    op.create_table(
-        'ai_agents',
+    sa.Table(
+        'ai_agents', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('agent_name', sa.String(100), nullable=False),
         sa.Column('agent_type', sa.String(50), nullable=False),
@@ -205,8 +206,8 @@ def upgrade() -> None:
     )
     
     # Create story_choices table
-    op.create_table(
-        'story_choices',
+    sa.Table(
+        'story_choices', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('story_id', postgresql.UUID(), nullable=False),
         sa.Column('character_id', postgresql.UUID(), nullable=False),
@@ -221,8 +222,8 @@ def upgrade() -> None:
     )
     
     # Create story_evolution table
-    op.create_table(
-        'story_evolution',
+    sa.Table(
+        'story_evolution', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('story_id', postgresql.UUID(), nullable=False),
         sa.Column('triggered_by_user', postgresql.UUID()),
@@ -237,8 +238,8 @@ def upgrade() -> None:
     )
     
     # Create quests table
-    op.create_table(
-        'quests',
+    sa.Table(
+        'quests', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('world_id', postgresql.UUID(), nullable=False),
         sa.Column('story_id', postgresql.UUID()),
@@ -258,8 +259,8 @@ def upgrade() -> None:
     )
     
     # Create quest_progress table
-    op.create_table(
-        'quest_progress',
+    sa.Table(
+        'quest_progress', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('quest_id', postgresql.UUID(), nullable=False),
         sa.Column('character_id', postgresql.UUID(), nullable=False),
@@ -276,8 +277,8 @@ def upgrade() -> None:
     )
     
     # Create ai_agent_activities table
-    op.create_table(
-        'ai_agent_activities',
+    sa.Table(
+        'ai_agent_activities', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('agent_id', postgresql.UUID(), nullable=False),
         sa.Column('world_id', postgresql.UUID()),
@@ -292,8 +293,8 @@ def upgrade() -> None:
     )
     
     # Create world_events table
-    op.create_table(
-        'world_events',
+    sa.Table(
+        'world_events', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('world_id', postgresql.UUID(), nullable=False),
         sa.Column('event_type', sa.String(50), nullable=False),
@@ -311,8 +312,8 @@ def upgrade() -> None:
     )
     
     # Create world_evolution_log table
-    op.create_table(
-        'world_evolution_log',
+    sa.Table(
+        'world_evolution_log', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('world_id', postgresql.UUID(), nullable=False),
         sa.Column('agent_id', postgresql.UUID(), nullable=False),
@@ -327,8 +328,8 @@ def upgrade() -> None:
     )
     
     # Create user_achievements table
-    op.create_table(
-        'user_achievements',
+    sa.Table(
+        'user_achievements', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('user_id', postgresql.UUID(), nullable=False),
         sa.Column('achievement_type', sa.String(50), nullable=False),
@@ -342,8 +343,8 @@ def upgrade() -> None:
     )
     
     # Create inventory_items table
-    op.create_table(
-        'inventory_items',
+    sa.Table(
+        'inventory_items', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('character_id', postgresql.UUID(), nullable=False),
         sa.Column('item_type', sa.String(50), nullable=False),
@@ -360,8 +361,8 @@ def upgrade() -> None:
     )
     
     # Create crafting_recipes table
-    op.create_table(
-        'crafting_recipes',
+    sa.Table(
+        'crafting_recipes', metadata,
         sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
         sa.Column('recipe_name', sa.String(100), nullable=False),
         sa.Column('ingredients', postgresql.JSONB(), nullable=False),
@@ -373,6 +374,14 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('recipe_name')
     )
+    
+    # Send the extension and every CREATE TABLE in a single round-trip;
+    # sorted_tables orders them so foreign key targets come first
+    dialect = op.get_context().dialect
+    statements = ['CREATE EXTENSION IF NOT EXISTS "pgcrypto"']  # Enable UUID extension
+    statements += [str(CreateTable(table).compile(dialect=dialect)).strip()
+                   for table in metadata.sorted_tables]
+    op.execute(';\n'.join(statements))
 
 
 def downgrade() -> None:
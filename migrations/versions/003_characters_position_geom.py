@@ -0,0 +1,55 @@
+"""Replace per-axis character position indexes with one 3D SP-GiST index
+
+Revision ID: 003_characters_position_geom
+Revises: 002_add_indexes
+Create Date: 2025-09-05 10:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003_characters_position_geom'
+down_revision = '002_add_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS postgis')
+
+    # 3D point derived from the JSONB position so bounding-box lookups can use
+    # a single spatial index instead of picking one of three per-axis B-trees
+    op.execute("""
+        ALTER TABLE characters ADD COLUMN position_geom geometry(PointZ)
+        GENERATED ALWAYS AS (ST_MakePoint(
+            (position->>'x')::float,
+            (position->>'y')::float,
+            (position->>'z')::float
+        )) STORED
+    """)
+
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '5s'")
+        op.execute("CREATE INDEX CONCURRENTLY idx_characters_position_geom ON characters "
+                   "USING spgist (position_geom spgist_geometry_ops_3d)")
+
+        op.drop_index('idx_characters_position_x', postgresql_concurrently=True)
+        op.drop_index('idx_characters_position_y', postgresql_concurrently=True)
+        op.drop_index('idx_characters_position_z', postgresql_concurrently=True)
+        op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('idx_characters_position_x', 'characters',
+                       [sa.text("(position->>'x')::integer")], postgresql_concurrently=True)
+        op.create_index('idx_characters_position_y', 'characters',
+                       [sa.text("(position->>'y')::integer")], postgresql_concurrently=True)
+        op.create_index('idx_characters_position_z', 'characters',
+                       [sa.text("(position->>'z')::integer")], postgresql_concurrently=True)
+
+        op.drop_index('idx_characters_position_geom', postgresql_concurrently=True)
+
+    op.drop_column('characters', 'position_geom')
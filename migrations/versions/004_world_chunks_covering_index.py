@@ -0,0 +1,49 @@
+"""Make the world chunk coordinate index a covering unique index
+
+Revision ID: 004_world_chunks_covering_index
+Revises: 003_characters_position_geom
+Create Date: 2025-09-05 11:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004_world_chunks_covering_index'
+down_revision = '003_characters_position_geom'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '5s'")
+
+        # version and last_modified ride along in the index so the visible-chunks
+        # query can be an index-only scan; block_data stays out (far too large)
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY idx_world_chunks_coords_covering "
+                   "ON world_chunks (world_id, chunk_x, chunk_y, chunk_z) "
+                   "INCLUDE (version, last_modified)")
+
+        # The covering index enforces uniqueness, so the old index and the
+        # equivalent unique constraint from 001 are redundant
+        op.drop_index('idx_world_chunks_coords', postgresql_concurrently=True)
+        op.execute("ALTER TABLE world_chunks "
+                   "DROP CONSTRAINT world_chunks_world_id_chunk_x_chunk_y_chunk_z_key")
+        op.execute("ALTER INDEX idx_world_chunks_coords_covering RENAME TO idx_world_chunks_coords")
+
+        # Refresh the visibility map so index-only scans skip the heap
+        op.execute("VACUUM ANALYZE world_chunks")
+
+        op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    op.create_unique_constraint('world_chunks_world_id_chunk_x_chunk_y_chunk_z_key', 'world_chunks',
+                                ['world_id', 'chunk_x', 'chunk_y', 'chunk_z'])
+
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_world_chunks_coords', postgresql_concurrently=True)
+        op.create_index('idx_world_chunks_coords', 'world_chunks',
+                       ['world_id', 'chunk_x', 'chunk_y', 'chunk_z'], postgresql_concurrently=True)
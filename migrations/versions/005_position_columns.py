@@ -0,0 +1,116 @@
+"""Store positions as integer columns instead of JSONB
+
+Revision ID: 005_position_columns
+Revises: 004_world_chunks_covering_index
+Create Date: 2025-09-05 14:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '005_position_columns'
+down_revision = '004_world_chunks_covering_index'
+branch_labels = None
+depends_on = None
+
+POSITIONED_TABLES = ('characters', 'npcs', 'world_structures')
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _backfill_positions(table: str) -> None:
+    """Copy JSONB positions into pos_x/pos_y/pos_z, committing every batch"""
+    update = f"""
+        UPDATE {table}
+        SET pos_x = COALESCE((position->>'x')::integer, 0),
+            pos_y = COALESCE((position->>'y')::integer, 0),
+            pos_z = COALESCE((position->>'z')::integer, 0)
+    """
+    if op.get_context().as_sql:
+        # Offline scripts can't loop on row counts, so emit one full UPDATE
+        op.execute(update)
+        return
+
+    bind = op.get_bind()
+    batch = sa.text(update + f"WHERE id IN (SELECT id FROM {table} WHERE pos_x IS NULL "
+                             f"LIMIT {BACKFILL_BATCH_SIZE})")
+    while bind.execute(batch).rowcount:
+        pass
+
+
+def upgrade() -> None:
+    for table in POSITIONED_TABLES:
+        op.add_column(table, sa.Column('pos_x', sa.Integer()))
+        op.add_column(table, sa.Column('pos_y', sa.Integer()))
+        op.add_column(table, sa.Column('pos_z', sa.Integer()))
+
+    # Backfill in small committed batches so no single UPDATE locks a whole table
+    with op.get_context().autocommit_block():
+        for table in POSITIONED_TABLES:
+            _backfill_positions(table)
+
+    for table in POSITIONED_TABLES:
+        for axis in ('pos_x', 'pos_y', 'pos_z'):
+            op.alter_column(table, axis, nullable=False, server_default='0')
+
+    # The 3D point now derives from the integer columns
+    op.drop_column('characters', 'position_geom')
+    op.execute("""
+        ALTER TABLE characters ADD COLUMN position_geom geometry(PointZ)
+        GENERATED ALWAYS AS (ST_MakePoint(pos_x, pos_y, pos_z)) STORED
+    """)
+
+    op.drop_index('idx_characters_position')
+    op.drop_index('idx_world_structures_position')
+    for table in POSITIONED_TABLES:
+        op.drop_column(table, 'position')
+
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '5s'")
+        op.execute("CREATE INDEX CONCURRENTLY idx_characters_position_geom ON characters "
+                   "USING spgist (position_geom spgist_geometry_ops_3d)")
+        op.create_index('idx_characters_world_position', 'characters',
+                       ['world_id', 'pos_x', 'pos_y', 'pos_z'], postgresql_concurrently=True)
+        op.create_index('idx_npcs_world_position', 'npcs',
+                       ['world_id', 'pos_x', 'pos_y', 'pos_z'], postgresql_concurrently=True)
+        op.create_index('idx_world_structures_world_position', 'world_structures',
+                       ['world_id', 'pos_x', 'pos_y', 'pos_z'], postgresql_concurrently=True)
+        op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    op.drop_index('idx_world_structures_world_position')
+    op.drop_index('idx_npcs_world_position')
+    op.drop_index('idx_characters_world_position')
+
+    for table in POSITIONED_TABLES:
+        op.add_column(table, sa.Column('position', postgresql.JSONB()))
+        op.execute(f"UPDATE {table} SET position = jsonb_build_object('x', pos_x, 'y', pos_y, 'z', pos_z)")
+        op.alter_column(table, 'position', nullable=False)
+    op.alter_column('characters', 'position', server_default='{"x": 0, "y": 0, "z": 0}')
+    op.alter_column('npcs', 'position', server_default='{"x": 0, "y": 0, "z": 0}')
+
+    op.drop_index('idx_characters_position_geom')
+    op.drop_column('characters', 'position_geom')
+    op.execute("""
+        ALTER TABLE characters ADD COLUMN position_geom geometry(PointZ)
+        GENERATED ALWAYS AS (ST_MakePoint(
+            (position->>'x')::float,
+            (position->>'y')::float,
+            (position->>'z')::float
+        )) STORED
+    """)
+    op.execute("CREATE INDEX idx_characters_position_geom ON characters "
+               "USING spgist (position_geom spgist_geometry_ops_3d)")
+
+    op.create_index('idx_characters_position', 'characters', ['position'],
+                   postgresql_using='gin')
+    op.create_index('idx_world_structures_position', 'world_structures', ['position'],
+                   postgresql_using='gin')
+
+    for table in POSITIONED_TABLES:
+        op.drop_column(table, 'pos_z')
+        op.drop_column(table, 'pos_y')
+        op.drop_column(table, 'pos_x')
@@ -0,0 +1,53 @@
+"""Generate time-ordered (v7) UUID primary keys
+
+Revision ID: 006_uuid7_primary_keys
+Revises: 005_position_columns
+Create Date: 2025-09-05 16:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006_uuid7_primary_keys'
+down_revision = '005_position_columns'
+branch_labels = None
+depends_on = None
+
+UUID_TABLES = (
+    'users', 'user_sessions', 'worlds', 'world_chunks', 'world_structures',
+    'characters', 'character_relationships', 'npcs', 'stories', 'ai_agents',
+    'story_choices', 'story_evolution', 'quests', 'quest_progress',
+    'ai_agent_activities', 'world_events', 'world_evolution_log',
+    'user_achievements', 'inventory_items', 'crafting_recipes',
+)
+
+
+def upgrade() -> None:
+    # UUIDv7: 48-bit millisecond timestamp prefix + random bits, with the
+    # version nibble switched from 4 to 7. Keys from the same period sort
+    # together, so inserts append to the right-hand B-tree leaf instead of
+    # touching a random page. The ORM generates the same format client-side;
+    # this default covers raw SQL inserts.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+            SELECT encode(
+                set_bit(set_bit(
+                    overlay(uuid_send(gen_random_uuid())
+                            placing substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                            FROM 1 FOR 6),
+                    52, 1), 53, 1),
+                'hex')::uuid
+        $$ LANGUAGE sql VOLATILE
+    """)
+
+    for table in UUID_TABLES:
+        op.alter_column(table, 'id', server_default=sa.text('uuid_generate_v7()'))
+
+
+def downgrade() -> None:
+    for table in UUID_TABLES:
+        op.alter_column(table, 'id', server_default=sa.text('gen_random_uuid()'))
+
+    op.execute('DROP FUNCTION IF EXISTS uuid_generate_v7()')
@@ -0,0 +1,42 @@
+"""Use BRIN indexes for append-only timestamp columns
+
+Revision ID: 007_brin_timestamp_indexes
+Revises: 006_uuid7_primary_keys
+Create Date: 2025-09-06 09:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_brin_timestamp_indexes'
+down_revision = '006_uuid7_primary_keys'
+branch_labels = None
+depends_on = None
+
+# (index name, table, column) - rows arrive in timestamp order, so a tiny
+# block-range index serves time-window scans as well as a B-tree does
+TIMESTAMP_INDEXES = (
+    ('idx_ai_activities_executed', 'ai_agent_activities', 'executed_at'),
+    ('idx_world_evolution_executed', 'world_evolution_log', 'executed_at'),
+    ('idx_world_chunks_modified', 'world_chunks', 'last_modified'),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '5s'")
+        for name, table, column in TIMESTAMP_INDEXES:
+            op.drop_index(name, postgresql_concurrently=True)
+            op.create_index(name, table, [column], postgresql_using='brin',
+                           postgresql_with={'pages_per_range': 32},
+                           postgresql_concurrently=True)
+        op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column in TIMESTAMP_INDEXES:
+            op.drop_index(name, postgresql_concurrently=True)
+            op.create_index(name, table, [column], postgresql_concurrently=True)
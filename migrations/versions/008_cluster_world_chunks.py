@@ -0,0 +1,30 @@
+"""Physically order world_chunks by coordinates
+
+Revision ID: 008_cluster_world_chunks
+Revises: 007_brin_timestamp_indexes
+Create Date: 2025-09-06 10:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008_cluster_world_chunks'
+down_revision = '007_brin_timestamp_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rewrite the heap in (world_id, chunk_x, chunk_y, chunk_z) order so a
+    # render area's neighbouring chunks share pages. CLUSTER holds an ACCESS
+    # EXCLUSIVE lock while it runs - on a populated database apply this in a
+    # maintenance window, or use pg_repack instead (see DATABASE_README.md).
+    op.execute('CLUSTER world_chunks USING idx_world_chunks_coords')
+    op.execute('ANALYZE world_chunks')
+
+
+def downgrade() -> None:
+    # Row order isn't schema; just forget the remembered clustering index
+    op.execute('ALTER TABLE world_chunks SET WITHOUT CLUSTER')
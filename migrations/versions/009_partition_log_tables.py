@@ -0,0 +1,112 @@
+"""Partition the high-volume log tables by month
+
+Revision ID: 009_partition_log_tables
+Revises: 008_cluster_world_chunks
+Create Date: 2025-09-06 13:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import date, datetime, timezone
+
+
+# revision identifiers, used by Alembic.
+revision = '009_partition_log_tables'
+down_revision = '008_cluster_world_chunks'
+branch_labels = None
+depends_on = None
+
+# Monthly partitions from the month the revision runs through this many months
+# ahead; `database_setup.py --create-partitions` keeps the same window ready
+# afterwards. Older rows copied from the plain tables land in the DEFAULT partition
+PARTITION_MONTHS_AHEAD = 3
+
+# table -> (partition key, foreign keys, index DDL fragments)
+# world_events uses created_at because executed_at stays NULL until an event runs
+LOG_TABLES = {
+    'ai_agent_activities': (
+        'executed_at',
+        [('agent_id', 'ai_agents', 'CASCADE'), ('world_id', 'worlds', 'CASCADE')],
+        [
+            "idx_ai_activities_agent ON ai_agent_activities (agent_id)",
+            "idx_ai_activities_world ON ai_agent_activities (world_id)",
+            "idx_ai_activities_executed ON ai_agent_activities USING brin (executed_at) "
+            "WITH (pages_per_range = 32)",
+        ],
+    ),
+    'world_evolution_log': (
+        'executed_at',
+        [('world_id', 'worlds', 'CASCADE'), ('agent_id', 'ai_agents', None)],
+        [
+            "idx_world_evolution_world ON world_evolution_log (world_id)",
+            "idx_world_evolution_executed ON world_evolution_log USING brin (executed_at) "
+            "WITH (pages_per_range = 32)",
+            "idx_world_evolution_impact ON world_evolution_log (impact_score)",
+        ],
+    ),
+    'world_events': (
+        'created_at',
+        [('world_id', 'worlds', 'CASCADE')],
+        [
+            "idx_world_events_scheduled ON world_events (world_id, scheduled_at) "
+            "WHERE status = 'scheduled'",
+            "idx_world_events_seasonal ON world_events (world_id) WHERE is_seasonal = true",
+        ],
+    ),
+}
+
+
+def _partition_months():
+    """Partition bounds from this month to the end of PARTITION_MONTHS_AHEAD months ahead"""
+    today = datetime.now(timezone.utc).date()
+    first = today.year * 12 + today.month - 1
+    for month in range(first, first + PARTITION_MONTHS_AHEAD + 2):
+        yield date(month // 12, month % 12 + 1, 1)
+
+
+def _rebuild_table(table: str, partition_key: str, foreign_keys, indexes, partitioned: bool) -> None:
+    """Recreate a table (partitioned or plain) and move its rows across"""
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    op.execute(f"ALTER TABLE {table}_old RENAME CONSTRAINT {table}_pkey TO {table}_old_pkey")
+
+    if partitioned:
+        op.execute(f"UPDATE {table}_old SET {partition_key} = CURRENT_TIMESTAMP "
+                   f"WHERE {partition_key} IS NULL")
+        op.execute(f"""
+            CREATE TABLE {table} (
+                LIKE {table}_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+                PRIMARY KEY (id, {partition_key})
+            ) PARTITION BY RANGE ({partition_key})
+        """)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        months = list(_partition_months())
+        for start, end in zip(months, months[1:]):
+            op.execute(f"CREATE TABLE {table}_y{start:%Y}m{start:%m} PARTITION OF {table} "
+                       f"FOR VALUES FROM ('{start}') TO ('{end}')")
+    else:
+        op.execute(f"""
+            CREATE TABLE {table} (
+                LIKE {table}_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+                PRIMARY KEY (id)
+            )
+        """)
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {partition_key} DROP NOT NULL")
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_old")
+    op.execute(f"DROP TABLE {table}_old")
+
+    for column, target, ondelete in foreign_keys:
+        op.create_foreign_key(f"{table}_{column}_fkey", table, target, [column], ['id'],
+                              ondelete=ondelete)
+    for index in indexes:
+        op.execute(f"CREATE INDEX {index}")
+
+
+def upgrade() -> None:
+    for table, (partition_key, foreign_keys, indexes) in LOG_TABLES.items():
+        _rebuild_table(table, partition_key, foreign_keys, indexes, partitioned=True)
+
+
+def downgrade() -> None:
+    for table, (partition_key, foreign_keys, indexes) in LOG_TABLES.items():
+        _rebuild_table(table, partition_key, foreign_keys, indexes, partitioned=False)
@@ -0,0 +1,42 @@
+"""Tighten character relationship indexes
+
+Revision ID: 010_relationship_indexes
+Revises: 009_partition_log_tables
+Create Date: 2025-09-06 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010_relationship_indexes'
+down_revision = '009_partition_log_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '5s'")
+
+        # The (character_id, target_character_id) unique constraint already
+        # serves lookups by character_id
+        op.drop_index('idx_character_relationships_character', postgresql_concurrently=True)
+
+        # Reverse lookups ("who knows X, and how much do they like them?")
+        # become index-only scans
+        op.drop_index('idx_character_relationships_target', postgresql_concurrently=True)
+        op.create_index('idx_character_relationships_target', 'character_relationships',
+                       ['target_character_id', 'character_id'],
+                       postgresql_include=['affinity_score'], postgresql_concurrently=True)
+        op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_character_relationships_target', postgresql_concurrently=True)
+        op.create_index('idx_character_relationships_target', 'character_relationships',
+                       ['target_character_id'], postgresql_concurrently=True)
+        op.create_index('idx_character_relationships_character', 'character_relationships',
+                       ['character_id'], postgresql_concurrently=True)
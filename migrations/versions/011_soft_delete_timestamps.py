@@ -0,0 +1,80 @@
+"""Replace is_active flags with deleted_at soft-delete timestamps
+
+Revision ID: 011_soft_delete_timestamps
+Revises: 010_relationship_indexes
+Create Date: 2025-09-07 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011_soft_delete_timestamps'
+down_revision = '010_relationship_indexes'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# table -> partial indexes as (name, columns) over the live rows
+SOFT_DELETE_TABLES = {
+    'user_sessions': [('idx_user_sessions_expires', ['expires_at'])],
+    'characters': [('idx_characters_world', ['world_id']), ('idx_characters_user', ['user_id'])],
+    'npcs': [('idx_npcs_world', ['world_id'])],
+    'stories': [('idx_stories_world', ['world_id'])],
+}
+
+
+def _backfill_deleted_at(table: str) -> None:
+    """Stamp already-inactive rows as deleted, committing every batch"""
+    update = f"UPDATE {table} SET deleted_at = COALESCE(updated_at, CURRENT_TIMESTAMP) "
+    if op.get_context().as_sql:
+        op.execute(update + "WHERE NOT is_active")
+        return
+
+    bind = op.get_bind()
+    batch = sa.text(update + f"WHERE id IN (SELECT id FROM {table} WHERE NOT is_active "
+                             f"AND deleted_at IS NULL LIMIT {BACKFILL_BATCH_SIZE})")
+    while bind.execute(batch).rowcount:
+        pass
+
+
+def _swap_partial_indexes(table: str, indexes, predicate: str) -> None:
+    """Rebuild partial indexes with a new predicate without a gap in coverage"""
+    for name, columns in indexes:
+        op.create_index(f'{name}_new', table, columns, postgresql_where=sa.text(predicate),
+                       postgresql_concurrently=True)
+        op.drop_index(name, postgresql_concurrently=True)
+        op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+
+
+def upgrade() -> None:
+    for table in SOFT_DELETE_TABLES:
+        op.add_column(table, sa.Column('deleted_at', sa.TIMESTAMP(timezone=True)))
+
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '5s'")
+        for table, indexes in SOFT_DELETE_TABLES.items():
+            _backfill_deleted_at(table)
+            # Live rows keep deleted_at NULL across updates, so their entries
+            # in these indexes never need rewriting
+            _swap_partial_indexes(table, indexes, 'deleted_at IS NULL')
+
+        op.execute("RESET lock_timeout")
+
+    for table in SOFT_DELETE_TABLES:
+        op.drop_column(table, 'is_active')
+
+
+def downgrade() -> None:
+    for table in SOFT_DELETE_TABLES:
+        op.add_column(table, sa.Column('is_active', sa.Boolean(), server_default='true'))
+        op.execute(f"UPDATE {table} SET is_active = false WHERE deleted_at IS NOT NULL")
+
+    with op.get_context().autocommit_block():
+        for table, indexes in SOFT_DELETE_TABLES.items():
+            _swap_partial_indexes(table, indexes, 'is_active = true')
+
+    for table in SOFT_DELETE_TABLES:
+        op.drop_column(table, 'deleted_at')
@@ -0,0 +1,44 @@
+"""Add trigram indexes for substring and fuzzy name search
+
+Revision ID: 012_trigram_search_indexes
+Revises: 011_soft_delete_timestamps
+Create Date: 2025-09-07 11:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '012_trigram_search_indexes'
+down_revision = '011_soft_delete_timestamps'
+branch_labels = None
+depends_on = None
+
+# (index name, table, column) - the B-tree indexes from 002 stay for equality
+# and prefix lookups; these cover ILIKE '%...%' and similarity() ranking
+TRIGRAM_INDEXES = (
+    ('idx_users_username_trgm', 'users', 'username'),
+    ('idx_users_email_trgm', 'users', 'email'),
+    ('idx_characters_name_trgm', 'characters', 'name'),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '5s'")
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(name, table, [column], postgresql_using='gin',
+                           postgresql_ops={column: 'gin_trgm_ops'},
+                           postgresql_concurrently=True)
+        op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    op.execute("DROP EXTENSION IF EXISTS pg_trgm")
@@ -0,0 +1,75 @@
+"""Move relationship interaction history into a character_interactions table
+
+Revision ID: 013_character_interactions
+Revises: 012_trigram_search_indexes
+Create Date: 2025-09-07 14:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '013_character_interactions'
+down_revision = '012_trigram_search_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Appending to the JSONB array rewrote (and re-TOASTed) the whole history on
+    # every interaction; one row per interaction makes each append a single insert
+    op.create_table(
+        'character_interactions',
+        sa.Column('id', postgresql.UUID(), nullable=False, server_default=sa.text('uuid_generate_v7()')),
+        sa.Column('relationship_id', postgresql.UUID(), nullable=False),
+        sa.Column('occurred_at', sa.TIMESTAMP(timezone=True), nullable=False,
+                  server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('kind', sa.String(50)),
+        sa.Column('payload', postgresql.JSONB(), server_default='{}'),
+        sa.ForeignKeyConstraint(['relationship_id'], ['character_relationships.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_character_interactions_relationship', 'character_interactions',
+                   ['relationship_id', sa.text('occurred_at DESC')])
+
+    op.execute("""
+        INSERT INTO character_interactions (relationship_id, occurred_at, kind, payload)
+        SELECT r.id,
+               COALESCE((elem->>'timestamp')::timestamptz, r.updated_at, CURRENT_TIMESTAMP),
+               elem->>'type',
+               COALESCE(elem->'details', '{}'::jsonb)
+        FROM character_relationships r,
+             jsonb_array_elements(r.interaction_history) elem
+        WHERE jsonb_typeof(r.interaction_history) = 'array'
+    """)
+
+    op.drop_column('character_relationships', 'interaction_history')
+
+
+def downgrade() -> None:
+    op.add_column('character_relationships',
+                  sa.Column('interaction_history', postgresql.JSONB(), server_default='[]'))
+    # The JSONB history only ever held the latest 50 interactions
+    op.execute("""
+        UPDATE character_relationships r
+        SET interaction_history = h.history
+        FROM (
+            SELECT relationship_id,
+                   jsonb_agg(jsonb_build_object('type', kind, 'details', payload,
+                                                'timestamp', occurred_at)
+                             ORDER BY occurred_at) AS history
+            FROM (
+                SELECT *, row_number() OVER (PARTITION BY relationship_id
+                                             ORDER BY occurred_at DESC) AS recency
+                FROM character_interactions
+            ) latest
+            WHERE recency <= 50
+            GROUP BY relationship_id
+        ) h
+        WHERE r.id = h.relationship_id
+    """)
+
+    op.drop_index('idx_character_interactions_relationship')
+    op.drop_table('character_interactions')
@@ -0,0 +1,53 @@
+"""Make session and AI activity storage UNLOGGED
+
+Revision ID: 014_unlogged_ephemeral_tables
+Revises: 013_character_interactions
+Create Date: 2025-09-08 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '014_unlogged_ephemeral_tables'
+down_revision = '013_character_interactions'
+branch_labels = None
+depends_on = None
+
+# Unlogged tables skip the WAL, so PostgreSQL truncates them after a crash and
+# they are not replicated to standbys. That is acceptable here: a lost session
+# only forces a re-login, and AI activities are telemetry.
+#
+# SET UNLOGGED rewrites the table under an ACCESS EXCLUSIVE lock - apply in a
+# maintenance window on a populated database.
+
+
+def _set_partitions(parent: str, persistence: str) -> None:
+    """Change every partition of a partitioned table; the parent holds no rows"""
+    op.execute(f"""
+        DO $$
+        DECLARE
+            part regclass;
+        BEGIN
+            FOR part IN SELECT inhrelid::regclass FROM pg_inherits
+                        WHERE inhparent = '{parent}'::regclass
+            LOOP
+                EXECUTE format('ALTER TABLE %s SET {persistence}', part);
+            END LOOP;
+        END $$
+    """)
+
+
+def upgrade() -> None:
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute("ALTER TABLE user_sessions SET UNLOGGED")
+    # ai_agent_activities is partitioned by month (009); partitions created later
+    # must be declared UNLOGGED as well
+    _set_partitions('ai_agent_activities', 'UNLOGGED')
+
+
+def downgrade() -> None:
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    _set_partitions('ai_agent_activities', 'LOGGED')
+    op.execute("ALTER TABLE user_sessions SET LOGGED")
@@ -0,0 +1,51 @@
+"""Key quest_progress by (quest_id, character_id) instead of a surrogate id
+
+Revision ID: 015_quest_progress_composite_key
+Revises: 014_unlogged_ephemeral_tables
+Create Date: 2025-09-08 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '015_quest_progress_composite_key'
+down_revision = '014_unlogged_ephemeral_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The index behind the UNIQUE constraint from 001 is owned by that
+    # constraint and can't be promoted, so build a fresh copy to become the key
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '5s'")
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY quest_progress_quest_character_pkey "
+                   "ON quest_progress (quest_id, character_id)")
+        op.execute("RESET lock_timeout")
+
+    # quest_progress is a pure join table and nothing references its id;
+    # dropping the column also drops quest_progress_pkey and its index
+    op.drop_column('quest_progress', 'id')
+    # USING INDEX renames the index to the constraint name
+    op.execute("ALTER TABLE quest_progress ADD CONSTRAINT quest_progress_pkey "
+               "PRIMARY KEY USING INDEX quest_progress_quest_character_pkey")
+    op.drop_constraint('quest_progress_quest_id_character_id_key', 'quest_progress', type_='unique')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '5s'")
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY quest_progress_quest_id_character_id_key "
+                   "ON quest_progress (quest_id, character_id)")
+        op.execute("RESET lock_timeout")
+
+    op.execute("ALTER TABLE quest_progress ADD CONSTRAINT quest_progress_quest_id_character_id_key "
+               "UNIQUE USING INDEX quest_progress_quest_id_character_id_key")
+    op.drop_constraint('quest_progress_pkey', 'quest_progress', type_='primary')
+    op.add_column('quest_progress',
+                  sa.Column('id', postgresql.UUID(), nullable=False,
+                            server_default=sa.text('uuid_generate_v7()')))
+    op.create_primary_key('quest_progress_pkey', 'quest_progress', ['id'])
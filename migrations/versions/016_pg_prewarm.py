@@ -0,0 +1,26 @@
+"""Enable pg_prewarm for warming hot indexes after a restart
+
+Revision ID: 016_pg_prewarm
+Revises: 015_quest_progress_composite_key
+Create Date: 2025-09-08 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '016_pg_prewarm'
+down_revision = '015_quest_progress_composite_key'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The hot indexes are loaded by `python database_setup.py --prewarm` after
+    # each deploy; see DATABASE_README.md for persistent autoprewarm
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_prewarm")
+
+
+def downgrade() -> None:
+    op.execute("DROP EXTENSION IF EXISTS pg_prewarm")
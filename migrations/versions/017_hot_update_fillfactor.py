@@ -0,0 +1,38 @@
+"""Lower FILLFACTOR on update-heavy tables so updates can stay HOT
+
+Revision ID: 017_hot_update_fillfactor
+Revises: 016_pg_prewarm
+Create Date: 2025-09-08 15:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '017_hot_update_fillfactor'
+down_revision = '016_pg_prewarm'
+branch_labels = None
+depends_on = None
+
+# Free space left on each heap page lets an UPDATE put the new row version on
+# the same page. When no indexed column changed, that heap-only tuple (HOT)
+# update skips index maintenance entirely
+FILLFACTORS = {
+    'characters': 80,
+    'user_sessions': 70,  # small rows, updated_at touched on every request
+    'quest_progress': 80,
+    'world_chunks': 80,
+}
+
+
+def upgrade() -> None:
+    # Only newly written pages honour the setting; existing pages pick it up
+    # on the next pg_repack / CLUSTER (see DATABASE_README.md)
+    for table, fillfactor in FILLFACTORS.items():
+        op.execute(f"ALTER TABLE {table} SET (fillfactor = {fillfactor})")
+
+
+def downgrade() -> None:
+    for table in FILLFACTORS:
+        op.execute(f"ALTER TABLE {table} RESET (fillfactor)")
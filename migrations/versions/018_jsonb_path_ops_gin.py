@@ -0,0 +1,48 @@
+"""Rebuild the JSONB GIN indexes with jsonb_path_ops
+
+Revision ID: 018_jsonb_path_ops_gin
+Revises: 017_hot_update_fillfactor
+Create Date: 2025-09-09 10:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '018_jsonb_path_ops_gin'
+down_revision = '017_hot_update_fillfactor'
+branch_labels = None
+depends_on = None
+
+# jsonb_path_ops indexes hash whole paths instead of every key and value, so
+# they are a fraction of the size of jsonb_ops and faster for @> lookups,
+# which is the only operator the game queries use on these columns
+GIN_INDEXES = {
+    'idx_stories_narrative_threads': ('stories', 'narrative_threads'),
+    'idx_story_choices_consequences': ('story_choices', 'consequences'),
+    'idx_npcs_personality': ('npcs', 'personality'),
+    'idx_ai_agents_config': ('ai_agents', 'configuration'),
+}
+
+
+def _rebuild_gin(opclass: str) -> None:
+    """Swap each GIN index for one using opclass without blocking writes"""
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '5s'")
+
+        for index, (table, column) in GIN_INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY {index}_new ON {table} "
+                       f"USING gin ({column} {opclass})")
+            op.drop_index(index, postgresql_concurrently=True)
+            op.execute(f"ALTER INDEX {index}_new RENAME TO {index}")
+
+        op.execute("RESET lock_timeout")
+
+
+def upgrade() -> None:
+    _rebuild_gin('jsonb_path_ops')
+
+
+def downgrade() -> None:
+    _rebuild_gin('jsonb_ops')
@@ -0,0 +1,44 @@
+"""Index world chunk summary keys instead of all of block_data
+
+Revision ID: 019_world_chunk_summary_indexes
+Revises: 018_jsonb_path_ops_gin
+Create Date: 2025-09-09 11:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '019_world_chunk_summary_indexes'
+down_revision = '018_jsonb_path_ops_gin'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '5s'")
+
+        # block_data holds thousands of block keys, so a GIN over the whole
+        # document is huge and slow to maintain; only index the small summary
+        # keys that queries actually filter on
+        op.create_index('idx_world_chunks_biome', 'world_chunks',
+                       [sa.text("(block_data->>'biome')")], postgresql_concurrently=True)
+        op.execute("CREATE INDEX CONCURRENTLY idx_world_chunks_structures ON world_chunks "
+                   "USING gin ((block_data -> 'structures') jsonb_path_ops)")
+        op.drop_index('idx_world_chunks_blocks', postgresql_concurrently=True)
+
+        op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '5s'")
+
+        op.create_index('idx_world_chunks_blocks', 'world_chunks', ['block_data'],
+                       postgresql_using='gin', postgresql_concurrently=True)
+        op.drop_index('idx_world_chunks_structures', postgresql_concurrently=True)
+        op.drop_index('idx_world_chunks_biome', postgresql_concurrently=True)
+
+        op.execute("RESET lock_timeout")
@@ -5,122 +5,138 @@ A fun CrewAI-powered game for 10-year-olds!
 """
 
 import random
-from typing import List, Dict
+import sys
+from collections import namedtuple
+from typing import List, Dict, Optional
+
+Adventure = namedtuple("Adventure", "scene question choices outcomes")
+
+SEP60 = "=" * 60
+SEP50 = "=" * 50
+_CONTINUE_PROMPT = "\nPress Enter to continue to the next adventure..."
+
+# Built once at import; every game shares the same read-only chapters
+_ADVENTURES = (
+    Adventure(
+        scene="🌲 You enter the Enchanted Forest where magical butterflies dance around glowing trees. A friendly fox with a golden collar approaches you!",
+        question="The fox says: 'Help me find the lost Crystal of Friendship!' What do you do?",
+        choices=(
+            "Follow the fox to look for clues",
+            "Ask forest animals for help", 
+            "Search near the sparkling stream"
+        ),
+        outcomes=(
+            "🦊 Great choice! The fox leads you to a secret clearing where wise woodland creatures are waiting to help you!",
+            "🐰 Smart thinking! The rabbits and squirrels tell you they saw the crystal near the Singing Waterfall!",
+            "🌊 Excellent idea! You find magical footprints leading to a hidden cave behind the waterfall!"
+        )
+    ),
+    Adventure(
+        scene="🏰 You discover an ancient castle made of crystal! A friendly dragon with rainbow scales guards the entrance.",
+        question="The dragon smiles and says: 'Answer my riddle to enter: What has wings but cannot fly, and sings the most beautiful lullaby?'",
+        choices=(
+            "A music box!",
+            "A butterfly!", 
+            "A bird in a cage!"
+        ),
+        outcomes=(
+            "🎵 Perfect! The dragon claps happily. 'You are very wise!' The crystal doors open with magical chimes!",
+            "🦋 Good try! The dragon smiles kindly. 'Close, but think of something that makes music!' Try again!",
+            "🐦 The dragon nods thoughtfully. 'You have a kind heart, but think of something magical that sings!' Try once more!"
+        )
+    ),
+    Adventure(
+        scene="✨ Inside the crystal castle, you find a room full of floating books and a wise owl wearing tiny glasses!",
+        question="The owl hoots: 'Welcome, young hero! Choose a magical power to help on your quest!'",
+        choices=(
+            "The power to talk to animals",
+            "The power to make flowers bloom",
+            "The power to create rainbow bridges"
+        ),
+        outcomes=(
+            "🐾 Amazing! Now you can understand every creature in the forest. They all want to be your friends!",
+            "🌸 Wonderful! Everywhere you step, beautiful flowers bloom and fill the air with sweet perfume!",
+            "🌈 Incredible! You can now create bridges of light to reach any place in the magical kingdom!"
+        )
+    )
+)
 
 class SimpleMagicGame:
-    def __init__(self):
-        self.adventures = [
-            {
-                "scene": "🌲 You enter the Enchanted Forest where magical butterflies dance around glowing trees. A friendly fox with a golden collar approaches you!",
-                "question": "The fox says: 'Help me find the lost Crystal of Friendship!' What do you do?",
-                "choices": [
-                    "Follow the fox to look for clues",
-                    "Ask forest animals for help", 
-                    "Search near the sparkling stream"
-                ],
-                "outcomes": [
-                    "🦊 Great choice! The fox leads you to a secret clearing where wise woodland creatures are waiting to help you!",
-                    "🐰 Smart thinking! The rabbits and squirrels tell you they saw the crystal near the Singing Waterfall!",
-                    "🌊 Excellent idea! You find magical footprints leading to a hidden cave behind the waterfall!"
-                ]
-            },
-            {
-                "scene": "🏰 You discover an ancient castle made of crystal! A friendly dragon with rainbow scales guards the entrance.",
-                "question": "The dragon smiles and says: 'Answer my riddle to enter: What has wings but cannot fly, and sings the most beautiful lullaby?'",
-                "choices": [
-                    "A music box!",
-                    "A butterfly!", 
-                    "A bird in a cage!"
-                ],
-                "outcomes": [
-                    "🎵 Perfect! The dragon claps happily. 'You are very wise!' The crystal doors open with magical chimes!",
-                    "🦋 Good try! The dragon smiles kindly. 'Close, but think of something that makes music!' Try again!",
-                    "🐦 The dragon nods thoughtfully. 'You have a kind heart, but think of something magical that sings!' Try once more!"
-                ]
-            },
-            {
-                "scene": "✨ Inside the crystal castle, you find a room full of floating books and a wise owl wearing tiny glasses!",
-                "question": "The owl hoots: 'Welcome, young hero! Choose a magical power to help on your quest!'",
-                "choices": [
-                    "The power to talk to animals",
-                    "The power to make flowers bloom",
-                    "The power to create rainbow bridges"
-                ],
-                "outcomes": [
-                    "🐾 Amazing! Now you can understand every creature in the forest. They all want to be your friends!",
-                    "🌸 Wonderful! Everywhere you step, beautiful flowers bloom and fill the air with sweet perfume!",
-                    "🌈 Incredible! You can now create bridges of light to reach any place in the magical kingdom!"
-                ]
-            }
-        ]
+    ENCOURAGEMENTS = (
+        "You're so brave! Every choice leads to something magical!",
+        "I believe in you! Follow your heart, young hero!",
+        "You're doing amazing! Trust your adventurous spirit!"
+    )
+    
+    def __init__(self, seed: Optional[int] = None):
+        # Private generator: no shared module state, and seedable for tests
+        self._rng = random.Random(seed)
+        self.adventures = _ADVENTURES
     
     def display_welcome(self):
-        print("\n" + "="*60)
+        print("\n" + SEP60)
         print("🏰✨ MAGIC ADVENTURE GAME ✨🏰")
-        print("="*60)
+        print(SEP60)
         print("Welcome, brave adventurer!")
         print("This game uses AI agents to create your story:")
         print("📚 Story Creator - Builds magical worlds")
         print("🎲 Game Master - Gives you choices") 
         print("💫 Adventure Helper - Cheers you on!")
-        print("="*60)
+        print(SEP60)
     
-    def play_adventure(self, adventure_num: int, player_name: str):
-        adventure = self.adventures[adventure_num]
-        
-        print(f"\n🌟 {player_name}'s Adventure #{adventure_num + 1}")
-        print("="*50)
-        
-        # Story Creator speaks
-        print("📚 Story Creator says:")
-        print(adventure["scene"])
-        
-        # Game Master presents choices
-        print(f"\n🎲 Game Master asks:")
-        print(adventure["question"])
-        print("\nYour choices:")
-        for i, choice in enumerate(adventure["choices"], 1):
-            print(f"{i}. {choice}")
-        
-        # Adventure Helper gives encouragement  
-        print(f"\n💫 Adventure Helper whispers:")
-        encouragements = [
-            "You're so brave! Every choice leads to something magical!",
-            "I believe in you! Follow your heart, young hero!",
-            "You're doing amazing! Trust your adventurous spirit!"
-        ]
-        print(random.choice(encouragements))
+    def play_adventure(self, adventure: Adventure, adventure_num: int, player_name: str):
+        _choice = self._rng.choice
+        _randint = self._rng.randint
         
         # Get choice (simulated for demo)
-        choice_num = random.randint(0, 2)  # Random choice for demo
-        print(f"\n✨ You choose: {adventure['choices'][choice_num]}")
+        encouragement = _choice(self.ENCOURAGEMENTS)
+        choice_num = _randint(0, 2)  # Random choice for demo
         
-        # Show outcome
-        print(f"\n🎉 Result:")
-        print(adventure["outcomes"][choice_num])
+        # Build the whole chapter and write it in one call
+        parts = [
+            f"\n🌟 {player_name}'s Adventure #{adventure_num + 1}\n",
+            SEP50 + "\n",
+            # Story Creator speaks
+            f"📚 Story Creator says:\n{adventure.scene}\n",
+            # Game Master presents choices
+            f"\n🎲 Game Master asks:\n{adventure.question}\n",
+            "\nYour choices:\n",
+        ]
+        parts.extend(f"{i}. {choice}\n" for i, choice in enumerate(adventure.choices, 1))
+        parts += [
+            # Adventure Helper gives encouragement
+            f"\n💫 Adventure Helper whispers:\n{encouragement}\n",
+            f"\n✨ You choose: {adventure.choices[choice_num]}\n",
+            # Show outcome
+            f"\n🎉 Result:\n{adventure.outcomes[choice_num]}\n",
+        ]
+        sys.stdout.write("".join(parts))
         
         return choice_num
     
     def play_full_game(self):
+        _choice = self._rng.choice
         self.display_welcome()
         
         player_names = ["Alex the Brave", "Luna the Kind", "Sam the Wise"]
-        player_name = random.choice(player_names)
+        player_name = _choice(player_names)
         
         print(f"\n🎭 Today you are: {player_name}")
         print("🎮 Starting your magical quest...")
         
         total_score = 0
         
-        for i in range(len(self.adventures)):
-            choice = self.play_adventure(i, player_name)
+        for i, adventure in enumerate(self.adventures):
+            choice = self.play_adventure(adventure, i, player_name)
             total_score += choice + 1
             
-            input(f"\nPress Enter to continue to the next adventure...")
+            # Only pause for a real player; piped or CI runs carry straight on
+            if sys.stdin.isatty():
+                input(_CONTINUE_PROMPT)
         
         # Final celebration
-        print(f"\n🎊 QUEST COMPLETE! 🎊")
-        print("="*50)
+        print("\n🎊 QUEST COMPLETE! 🎊")
+        print(SEP50)
         print(f"Congratulations, {player_name}!")
         print("You've completed your magical adventure!")
         print("🌟 You showed bravery, kindness, and wisdom!")
@@ -130,6 +146,9 @@ class SimpleMagicGame:
 
 def main():
     """Run the Simple Magic Game"""
+    # Block-buffer stdout; input() flushes it before each prompt, so chapters
+    # still appear before the game waits for Enter
+    sys.stdout.reconfigure(line_buffering=False)
     print("🚀 Loading Magic Adventure Game...")
     print("🎭 This is a CrewAI-powered story game!")
     print("📝 (Running with simulated AI responses)")
@@ -137,10 +156,10 @@ def main():
     try:
         game = SimpleMagicGame()
         game.play_full_game()
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, EOFError):
         print("\n\n👋 Thanks for playing! Come back anytime for more adventures!")
-    except Exception as e:
-        print(f"\n🎮 Game demo completed! (Error: {e})")
+    finally:
+        sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
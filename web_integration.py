@@ -18,20 +18,29 @@ Features:
 Designed to be modular and scalable for various web technologies.
 """
 
+import os
+import sys
+import importlib.util
 import json
+import time
+import heapq
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union, Callable
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime
+from typing import Dict, List, Set, Any, Optional, Union, Callable
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pathlib import Path
 import uuid
+import secrets
 import logging
 
 try:
     from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends
     from fastapi.middleware.cors import CORSMiddleware
-    from fastapi.responses import JSONResponse, HTMLResponse
+    from fastapi.responses import JSONResponse, HTMLResponse, ORJSONResponse, Response
     from fastapi.staticfiles import StaticFiles
     from pydantic import BaseModel, Field
     import uvicorn
@@ -40,6 +49,18 @@ except ImportError:
     FastAPI = None
     print("⚠️ FastAPI not installed. Web integration will have limited functionality.")
 
+try:
+    import orjson
+except ImportError:
+    # Fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:
+    # Sessions and broadcasts stay process-local (single worker only)
+    redis_asyncio = None
+
 # Import our game modules
 from game_orchestrator import MagicAdventureOrchestrator, GameContext, GameState
 from crewai_agents import MagicAdventureAgents
@@ -51,6 +72,24 @@ from agent_config import AgentConfigurationManager
 logger = logging.getLogger(__name__)
 
 
+def _json_dumps(obj: Any) -> str:
+    """Serialize for WebSocket text frames, using orjson when available"""
+    if orjson:
+        return orjson.dumps(obj, default=str).decode()
+    return json.dumps(obj, default=str)
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Parse an incoming WebSocket message"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+# Keepalives as sent by JSON.stringify({type: 'ping'}); matched verbatim so
+# they skip JSON decoding
+_PING_FRAME = '{"type":"ping"}'
+_PONG_FRAME = _json_dumps({"type": "pong"})
+
+
 # Pydantic models for API validation
 if FastAPI:
     class PlayerInfo(BaseModel):
@@ -76,20 +115,56 @@ if FastAPI:
         metadata: Optional[Dict[str, Any]] = None
 
 
+@dataclass(slots=True)
+class Session:
+    """In-process state for one game session"""
+    id: str
+    orchestrator: MagicAdventureOrchestrator
+    context: GameContext
+    created_at: datetime
+    last_activity_mono: float  # time.monotonic(); created_at stays a datetime for display
+    player_info: Dict[str, Any]
+    action_sem: asyncio.Semaphore
+
+
+@dataclass(slots=True)
+class ConnectionRecord:
+    """One open WebSocket and the session it belongs to"""
+    websocket: WebSocket
+    session_id: str
+    connected_at: datetime
+
+
 class SessionManager:
     """Manages game sessions and player states"""
     
     def __init__(self):
-        self.sessions = {}
+        self.sessions: Dict[str, Session] = {}
         self.session_timeouts = {}
+        self._expiry_heap: List[tuple] = []  # (expires_at, session_id), soonest first
         self.cleanup_interval = 3600  # 1 hour
+        self.session_ttl = 24 * 3600  # seconds
+        self.active_window = 30 * 60  # seconds since last activity
+        # The orchestrator and GameContext aren't thread-safe, so one action per
+        # session runs on the executor at a time; extra actions wait their turn
+        self.max_concurrent_actions = 1
+        # Shared session metadata for multi-worker deployments, and the
+        # executor for rehydrated games' start calls (both set by GameAPI)
+        self.redis = None
+        self.executor = None
         
         logger.info("🎮 Initialized Session Manager")
     
     def create_session(self, player_info: Dict[str, Any]) -> str:
         """Create a new game session"""
         session_id = str(uuid.uuid4())
+        self._add_session(session_id, player_info, datetime.now())
         
+        logger.info(f"📝 Created session {session_id} for {player_info.get('name')}")
+        return session_id
+    
+    def _add_session(self, session_id: str, player_info: Dict[str, Any], created_at: datetime) -> Session:
+        """Build the in-process session state (orchestrator, context, timers)"""
         # Initialize game context
         context = GameContext(
             player_name=player_info.get("name", "Adventurer"),
@@ -99,28 +174,69 @@ class SessionManager:
         # Create orchestrator for this session
         orchestrator = MagicAdventureOrchestrator(context)
         
-        self.sessions[session_id] = {
-            "id": session_id,
-            "orchestrator": orchestrator,
-            "context": context,
-            "created_at": datetime.now(),
-            "last_activity": datetime.now(),
-            "player_info": player_info
-        }
+        now = time.monotonic()
+        session = self.sessions[session_id] = Session(
+            id=session_id,
+            orchestrator=orchestrator,
+            context=context,
+            created_at=created_at,
+            last_activity_mono=now,
+            player_info=player_info,
+            action_sem=asyncio.Semaphore(self.max_concurrent_actions)
+        )
         
         # Set timeout
-        self.session_timeouts[session_id] = datetime.now() + timedelta(hours=24)
+        self.session_timeouts[session_id] = now + self.session_ttl
+        heapq.heappush(self._expiry_heap, (now + self.session_ttl, session_id))
+        return session
+    
+    async def save_session(self, session_id: str):
+        """Publish a session's metadata so other workers can pick it up"""
+        session = self.sessions.get(session_id)
+        if self.redis is None or session is None:
+            return
         
-        logger.info(f"📝 Created session {session_id} for {player_info.get('name')}")
-        return session_id
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(f"sess:{session_id}", mapping={
+                "player_info": _json_dumps(session.player_info),
+                "created_at": session.created_at.isoformat()
+            })
+            pipe.expire(f"sess:{session_id}", self.session_ttl)
+            await pipe.execute()
     
-    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+    async def resolve_session(self, session_id: str) -> Optional[Session]:
+        """Get a session, rehydrating it from Redis if another worker created it"""
+        session = self.get_session(session_id)
+        if session is not None or self.redis is None:
+            return session
+        
+        stored = await self.redis.hgetall(f"sess:{session_id}")
+        if not stored or session_id in self.sessions:
+            return self.get_session(session_id)
+        
+        # The orchestrator only lives in-process, so a worker without it starts
+        # a new game for the same player; sticky routing keeps story progress
+        logger.info(f"♻️ Rehydrating session {session_id} from Redis")
+        player_info = _json_loads(stored["player_info"])
+        session = self._add_session(session_id, player_info, datetime.fromisoformat(stored["created_at"]))
+        
+        # Holding the action semaphore makes concurrent requests for this
+        # session wait until the game has started
+        async with session.action_sem:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                self.executor, session.orchestrator.start_new_game,
+                player_info.get("name", "Adventurer"), player_info.get("character_class", "Adventurer")
+            )
+        return session
+    
+    def get_session(self, session_id: str) -> Optional[Session]:
         """Get session by ID"""
-        if session_id in self.sessions:
+        session = self.sessions.get(session_id)
+        if session is not None:
             # Update last activity
-            self.sessions[session_id]["last_activity"] = datetime.now()
-            return self.sessions[session_id]
-        return None
+            session.last_activity_mono = time.monotonic()
+        return session
     
     def delete_session(self, session_id: str) -> bool:
         """Delete a session"""
@@ -134,38 +250,62 @@ class SessionManager:
     
     def cleanup_expired_sessions(self):
         """Remove expired sessions"""
-        now = datetime.now()
-        expired_sessions = [
-            session_id for session_id, timeout in self.session_timeouts.items()
-            if now > timeout
-        ]
+        now = time.monotonic()
+        heap = self._expiry_heap
+        expired_sessions = 0
         
-        for session_id in expired_sessions:
-            self.delete_session(session_id)
+        # Only pop entries that are due; entries left behind by deleted or
+        # re-timed sessions no longer match session_timeouts and are dropped
+        while heap and heap[0][0] < now:
+            expires_at, session_id = heapq.heappop(heap)
+            if self.session_timeouts.get(session_id) == expires_at:
+                self.delete_session(session_id)
+                expired_sessions += 1
         
         if expired_sessions:
-            logger.info(f"🧹 Cleaned up {len(expired_sessions)} expired sessions")
+            logger.info(f"🧹 Cleaned up {expired_sessions} expired sessions")
     
     def get_session_statistics(self) -> Dict[str, Any]:
         """Get session statistics"""
-        now = datetime.now()
-        active_sessions = sum(1 for s in self.sessions.values() 
-                            if now - s["last_activity"] < timedelta(minutes=30))
+        active_since = time.monotonic() - self.active_window
+        active_sessions = 0
+        oldest = newest = None
+        
+        # One pass over the sessions for all three figures
+        for s in self.sessions.values():
+            if s.last_activity_mono > active_since:
+                active_sessions += 1
+            created_at = s.created_at
+            if oldest is None or created_at < oldest:
+                oldest = created_at
+            if newest is None or created_at > newest:
+                newest = created_at
         
         return {
             "total_sessions": len(self.sessions),
             "active_sessions": active_sessions,
-            "oldest_session": min([s["created_at"] for s in self.sessions.values()]) if self.sessions else None,
-            "newest_session": max([s["created_at"] for s in self.sessions.values()]) if self.sessions else None
+            "oldest_session": oldest,
+            "newest_session": newest
         }
 
 
 class WebSocketManager:
     """Manages WebSocket connections for real-time communication"""
     
+    CHANNEL_PREFIX = "channel:session:"
+    
     def __init__(self):
-        self.connections: Dict[str, WebSocket] = {}
-        self.session_connections: Dict[str, List[str]] = {}
+        self.connections: Dict[str, ConnectionRecord] = {}
+        self.session_connections: Dict[str, Set[str]] = {}
+        # Per-session outgoing queues, drained by one flusher task per session
+        self.outboxes: Dict[str, asyncio.Queue] = {}
+        self._flushers: Dict[str, asyncio.Task] = {}
+        self.batch_interval = 0.01  # seconds a burst may accumulate before it is sent
+        # With Redis, batches go through pub/sub so whichever worker holds the
+        # session's sockets delivers them
+        self.redis = None
+        self._relay_task: Optional[asyncio.Task] = None
+        self._deliveries: Dict[str, asyncio.Task] = {}  # latest relayed send per session
         
         logger.info("🔌 Initialized WebSocket Manager")
     
@@ -173,39 +313,147 @@ class WebSocketManager:
         """Connect a WebSocket for a session"""
         await websocket.accept()
         
-        connection_id = str(uuid.uuid4())
-        self.connections[connection_id] = websocket
+        # Connection ids never leave this process, so any unique token will do
+        connection_id = secrets.token_hex(16)
+        self.connections[connection_id] = ConnectionRecord(websocket, session_id, datetime.now())
         
-        if session_id not in self.session_connections:
-            self.session_connections[session_id] = []
-        self.session_connections[session_id].append(connection_id)
+        self.session_connections.setdefault(session_id, set()).add(connection_id)
+        self._outbox(session_id)
         
         logger.info(f"🔗 WebSocket connected: {connection_id} for session {session_id}")
         return connection_id
     
     def disconnect(self, connection_id: str):
         """Disconnect a WebSocket"""
-        if connection_id in self.connections:
-            del self.connections[connection_id]
-            
+        record = self.connections.pop(connection_id, None)
+        if record is not None:
             # Remove from session connections
-            for session_id, conn_list in self.session_connections.items():
-                if connection_id in conn_list:
-                    conn_list.remove(connection_id)
-                    break
+            session_id = record.session_id
+            conn_ids = self.session_connections.get(session_id)
+            if conn_ids is not None:
+                conn_ids.discard(connection_id)
+                if not conn_ids:
+                    del self.session_connections[session_id]
+                    # A non-empty outbox is left to its flusher, which stops
+                    # once the queue drains
+                    queue = self.outboxes.get(session_id)
+                    if queue is not None and queue.empty():
+                        self._close_outbox(session_id)
             
             logger.info(f"🔌 WebSocket disconnected: {connection_id}")
     
     async def send_to_session(self, session_id: str, message: Dict[str, Any]):
         """Send message to all connections for a session"""
-        if session_id in self.session_connections:
-            for connection_id in self.session_connections[session_id][:]:  # Copy to avoid modification during iteration
-                if connection_id in self.connections:
-                    try:
-                        await self.connections[connection_id].send_text(json.dumps(message))
-                    except Exception as e:
-                        logger.warning(f"Failed to send to connection {connection_id}: {e}")
-                        self.disconnect(connection_id)
+        if self.redis is not None:
+            await self.redis.publish(self.CHANNEL_PREFIX + session_id, _json_dumps(message))
+        elif session_id in self.session_connections:
+            await self._send_local(session_id, _json_dumps(message))
+    
+    async def _send_local(self, session_id: str, payload: str):
+        """Write a serialized message to this worker's sockets for a session"""
+        conn_ids = list(self.session_connections.get(session_id, ()))  # Copy to avoid modification during sends
+        if not conn_ids:
+            return
+        
+        # Write to every socket concurrently. Text frames are kept because
+        # browser clients JSON.parse event.data directly
+        results = await asyncio.gather(
+            *(self.connections[conn_id].websocket.send_text(payload) for conn_id in conn_ids),
+            return_exceptions=True
+        )
+        
+        for connection_id, result in zip(conn_ids, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to send to connection {connection_id}: {result}")
+                self.disconnect(connection_id)
+    
+    def _outbox(self, session_id: str) -> asyncio.Queue:
+        """Get a session's outgoing queue, starting its flusher on first use"""
+        queue = self.outboxes.get(session_id)
+        if queue is None:
+            queue = self.outboxes[session_id] = asyncio.Queue()
+            self._flushers[session_id] = asyncio.create_task(self._flush_loop(session_id, queue))
+        return queue
+    
+    def _close_outbox(self, session_id: str):
+        """Drop a session's outgoing queue and stop its flusher"""
+        del self.outboxes[session_id]
+        self._flushers.pop(session_id).cancel()
+    
+    def enqueue(self, session_id: str, message: Dict[str, Any]):
+        """Queue a message for the session's next batch frame"""
+        # Through Redis the session's sockets may be on another worker, so
+        # queue even without a local connection
+        if self.redis is not None or session_id in self.session_connections:
+            self._outbox(session_id).put_nowait(message)
+    
+    async def _flush_loop(self, session_id: str, queue: asyncio.Queue):
+        """Coalesce queued messages into one frame per batch_interval"""
+        while True:
+            batch = [await queue.get()]
+            await asyncio.sleep(self.batch_interval)
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            # A lone message goes out unwrapped, as it did before batching
+            message = batch[0] if len(batch) == 1 else {"type": "batch", "items": batch}
+            try:
+                await self.send_to_session(session_id, message)
+            except Exception:
+                logger.exception(f"Failed to flush batch for session {session_id}")
+            
+            if queue.empty() and session_id not in self.session_connections:
+                if self.outboxes.get(session_id) is queue:
+                    del self.outboxes[session_id]
+                    del self._flushers[session_id]
+                return
+    
+    def start_relay(self, client):
+        """Publish through Redis and deliver messages for this worker's sockets"""
+        self.redis = client
+        self._relay_task = asyncio.create_task(self._relay_loop())
+    
+    async def stop_relay(self):
+        """Stop the Redis subscriber"""
+        if self._relay_task is not None:
+            self._relay_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._relay_task
+            self._relay_task = None
+    
+    async def _relay_loop(self):
+        """Fan out published session messages to local sockets"""
+        # One pattern subscription per worker; messages for sessions whose
+        # sockets live elsewhere are dropped with a dict lookup
+        prefix = self.CHANNEL_PREFIX
+        pubsub = self.redis.pubsub()
+        await pubsub.psubscribe(prefix + "*")
+        try:
+            async for item in pubsub.listen():
+                if item["type"] != "pmessage":
+                    continue
+                session_id = item["channel"][len(prefix):]
+                if session_id in self.session_connections:
+                    self._deliver(session_id, item["data"])
+        finally:
+            await pubsub.reset()
+    
+    def _deliver(self, session_id: str, payload: str):
+        """Send a relayed message in its own task, after the session's previous one"""
+        # A slow socket then holds up only its own session's messages, and
+        # each session still receives them in publish order
+        previous = self._deliveries.get(session_id)
+        task = asyncio.create_task(self._deliver_after(previous, session_id, payload))
+        self._deliveries[session_id] = task
+        task.add_done_callback(
+            lambda done: self._deliveries.pop(session_id) if self._deliveries.get(session_id) is done else None
+        )
+    
+    async def _deliver_after(self, previous: Optional[asyncio.Task], session_id: str, payload: str):
+        """Wait for an earlier delivery to finish, then send"""
+        if previous is not None:
+            await asyncio.wait([previous])
+        await self._send_local(session_id, payload)
     
     async def broadcast_agent_update(self, session_id: str, agent_name: str, content: str, metadata: Optional[Dict] = None):
         """Broadcast agent update to session"""
@@ -216,86 +464,303 @@ class WebSocketManager:
             "metadata": metadata or {},
             "timestamp": datetime.now().isoformat()
         }
-        await self.send_to_session(session_id, message)
+        self.enqueue(session_id, message)
 
 
 class ResponseCache:
-    """Cache for agent responses to improve performance"""
+    """LRU cache for agent responses to improve performance"""
     
     def __init__(self, max_size: int = 1000, ttl_seconds: int = 300):
-        self.cache = {}
-        self.timestamps = {}
+        # key -> (value, monotonic expiry); least recently used first
+        self.cache = OrderedDict()
         self.max_size = max_size
-        self.ttl = timedelta(seconds=ttl_seconds)
+        self.ttl = ttl_seconds
         
         logger.info("💾 Initialized Response Cache")
     
     def get(self, key: str) -> Optional[Any]:
         """Get cached response"""
-        if key in self.cache:
-            if datetime.now() - self.timestamps[key] < self.ttl:
-                return self.cache[key]
-            else:
-                # Expired
-                del self.cache[key]
-                del self.timestamps[key]
-        return None
-    
-    def set(self, key: str, value: Any):
-        """Set cached response"""
-        # Cleanup if at max size
-        if len(self.cache) >= self.max_size:
-            self._cleanup_oldest()
-        
-        self.cache[key] = value
-        self.timestamps[key] = datetime.now()
-    
-    def _cleanup_oldest(self):
-        """Remove oldest entries"""
-        sorted_items = sorted(self.timestamps.items(), key=lambda x: x[1])
-        oldest_keys = [k for k, _ in sorted_items[:self.max_size // 4]]
-        
-        for key in oldest_keys:
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            # Expired
             del self.cache[key]
-            del self.timestamps[key]
+            return None
+        
+        self.cache.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Set cached response (for ttl seconds, default self.ttl), evicting the least recently used entries when full"""
+        if key in self.cache:
+            self.cache.move_to_end(key)
+        else:
+            while len(self.cache) >= self.max_size:
+                self.cache.popitem(last=False)
+        
+        self.cache[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
     
     def clear(self):
         """Clear all cached responses"""
         self.cache.clear()
-        self.timestamps.clear()
+
+
+class MigrationRunner:
+    """Runs Alembic migrations at startup in sync, async (background) or skip mode"""
+    
+    MODES = ("sync", "async", "skip")
+    # Session-level advisory lock held around the upgrade, so when several
+    # workers start at once only one runs the revisions; the rest wait and
+    # then find the database already at head
+    ADVISORY_LOCK_ID = 0x4D41474D4947  # "MAGMIG"
+    
+    def __init__(self, mode: Optional[str] = None, alembic_ini: Optional[str] = None):
+        self.mode = (mode or os.environ.get("MIGRATION_MODE", "skip")).lower()
+        if self.mode not in self.MODES:
+            raise ValueError(f"MIGRATION_MODE must be one of {self.MODES}, got {self.mode!r}")
+        
+        self.alembic_ini = alembic_ini or str(Path(__file__).with_name("alembic.ini"))
+        self.status = "pending"  # pending, migrating, complete, failed, skipped
+        self.error: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        
+        logger.info(f"🗃️ Initialized Migration Runner (mode: {self.mode})")
+    
+    def _config(self):
+        """Alembic config that leaves the application's logging setup alone"""
+        from alembic.config import Config
+        
+        config = Config(self.alembic_ini)
+        config.set_main_option("script_location", str(Path(self.alembic_ini).with_name("migrations")))
+        config.attributes["configure_logger"] = False
+        return config
+    
+    def _database_url(self) -> str:
+        return os.environ.get("DATABASE_URL", self._config().get_main_option("sqlalchemy.url"))
+    
+    def _upgrade(self):
+        """Blocking upgrade to head, serialised across processes by ADVISORY_LOCK_ID"""
+        from alembic import command
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.pool import NullPool
+        
+        engine = create_engine(self._database_url(), poolclass=NullPool)
+        try:
+            # Autocommit so the lock connection idles outside a transaction
+            # (idle_in_transaction_session_timeout would end it) while Alembic
+            # migrates on its own connection
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+                lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": self.ADVISORY_LOCK_ID})
+                try:
+                    command.upgrade(self._config(), "head")
+                finally:
+                    lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": self.ADVISORY_LOCK_ID})
+        finally:
+            engine.dispose()
+    
+    async def run(self):
+        """Upgrade to head in a worker thread so the event loop keeps serving"""
+        self.status = "migrating"
+        self.started_at = datetime.now()
+        logger.info("🗃️ Running database migrations...")
+        
+        try:
+            await asyncio.to_thread(self._upgrade)
+            self.status = "complete"
+            logger.info("✅ Database migrations complete")
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            logger.error(f"❌ Database migrations failed: {e}")
+        finally:
+            self.finished_at = datetime.now()
+    
+    async def start(self):
+        """Apply MIGRATION_MODE - called from the application lifespan"""
+        if self.mode == "sync":
+            await self.run()
+        elif self.mode == "async":
+            self._task = asyncio.create_task(self.run())
+        else:
+            self.status = "skipped"
+    
+    async def stop(self):
+        """Wait for a background migration on shutdown; DDL is not safe to cancel midway"""
+        if self._task and not self._task.done():
+            await self._task
+    
+    def _revisions(self) -> Dict[str, Any]:
+        """Applied revision from alembic_version and the head revision on disk"""
+        from alembic.runtime.migration import MigrationContext
+        from alembic.script import ScriptDirectory
+        from sqlalchemy import create_engine
+        from sqlalchemy.pool import NullPool
+        
+        target = ScriptDirectory.from_config(self._config()).get_current_head()
+        engine = create_engine(self._database_url(), poolclass=NullPool)
+        try:
+            with engine.connect() as connection:
+                current = MigrationContext.configure(connection).get_current_revision()
+        finally:
+            engine.dispose()
+        return {"current_revision": current, "target_revision": target, "up_to_date": current == target}
+    
+    async def get_status(self) -> Dict[str, Any]:
+        """Migration state plus current and target revisions"""
+        status = {
+            "mode": self.mode,
+            "status": self.status,
+            "error": self.error,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+        try:
+            status.update(await asyncio.to_thread(self._revisions))
+        except Exception as e:
+            status["revision_error"] = str(e)
+        return status
 
 
 class GameAPI:
     """Main API class for the Magic Adventure Game"""
     
+    # Action types where an identical request arriving while the first is
+    # still running (a double-clicked choice or a client retry) shares its result
+    DEDUPED_ACTION_TYPES = frozenset({"choice"})
+    STATUS_TTL = 1.0  # seconds a status response is reused; it includes session_duration
+    STATS_TTL = 1.0  # seconds /api/admin/stats results are reused
+    
     def __init__(self):
         self.app = None
         self.session_manager = SessionManager()
         self.websocket_manager = WebSocketManager()
         self.response_cache = ResponseCache()
+        self.migration_runner = MigrationRunner()
         self.game_logger = GameLogger("magic_adventure_api")
         self.error_handler = ErrorHandler(self.game_logger)
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self._inflight_actions: Dict[tuple, asyncio.Task] = {}
+        # Orchestrator calls block on CrewAI/LLM round-trips; run them here so
+        # the event loop keeps serving other clients
+        self._executor = ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 1) * 4),
+            thread_name_prefix="crew"
+        )
         
         if FastAPI:
             self._setup_fastapi()
         
         logger.info("🚀 Initialized Game API")
     
+    def _game_response(self, game_state: str, data: Dict[str, Any]):
+        """GameResponse-shaped JSON response built directly, skipping a second Pydantic validation"""
+        return self._response_class(content={
+            "success": True,
+            "game_state": game_state,
+            "message": None,
+            "data": data,
+            "processing_time": 0.0,
+            "timestamp": datetime.now().isoformat()
+        })
+    
+    def _cache_key(self, session_id: str, session: Session, *parts: str) -> str:
+        """Cache key tied to the session's current turn, so any new action invalidates it"""
+        context = session.context
+        turn = len(context.player_choices)
+        return ":".join([session_id, context.game_state.value, str(turn), *parts])
+    
+    async def _apply_action(self, session_id: str, session: Session, action_text: str, action_type: str):
+        """Run one player action, broadcast its result and build the response"""
+        async with session.action_sem:
+            response = await self._run_blocking(
+                session.orchestrator.process_player_action, action_text, action_type
+            )
+        
+        # Broadcast update via WebSocket
+        self.websocket_manager.enqueue(session_id, {
+            "type": "action_result",
+            "data": response
+        })
+        return self._game_response(session.context.game_state.value, response)
+    
+    async def _run_blocking(self, func: Callable, *args):
+        """Run a blocking orchestrator call on the executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    async def _cleanup_loop(self):
+        """Sweep expired sessions every cleanup_interval, off the request path"""
+        while True:
+            await asyncio.sleep(self.session_manager.cleanup_interval)
+            try:
+                self.session_manager.cleanup_expired_sessions()
+            except Exception:
+                logger.exception("Session cleanup failed")
+    
+    async def _connect_redis(self):
+        """Share sessions and broadcasts through REDIS_URL so several workers can serve one game"""
+        url = os.getenv("REDIS_URL")
+        if not url or redis_asyncio is None:
+            return None
+        
+        client = redis_asyncio.from_url(url, decode_responses=True)
+        try:
+            await client.ping()
+        except Exception as e:
+            logger.warning(f"Redis unavailable, keeping sessions in-process: {e}")
+            await client.aclose()
+            return None
+        
+        self.session_manager.redis = client
+        self.session_manager.executor = self._executor
+        self.websocket_manager.start_relay(client)
+        logger.info("📡 Sharing sessions and broadcasts through Redis")
+        return client
+    
     def _setup_fastapi(self):
         """Setup FastAPI application"""
+        @asynccontextmanager
+        async def lifespan(app):
+            # In async mode this returns immediately and /health reports
+            # "migrating" until the background upgrade finishes
+            await self.migration_runner.start()
+            redis_client = await self._connect_redis()
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+            yield
+            self._cleanup_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._cleanup_task
+            if redis_client is not None:
+                await self.websocket_manager.stop_relay()
+                await redis_client.aclose()
+            await self.migration_runner.stop()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        
+        self._response_class = ORJSONResponse if orjson else JSONResponse
         self.app = FastAPI(
             title="Magic Adventure Game API",
             description="CrewAI-powered interactive fantasy adventure game",
-            version="1.0.0"
+            version="1.0.0",
+            lifespan=lifespan,
+            default_response_class=self._response_class
         )
         
-        # Add CORS middleware
+        # Add CORS middleware. ALLOWED_ORIGINS is a comma-separated list; an
+        # explicit list is matched as a set instead of reflecting every origin
+        origins = [origin.strip() for origin in os.environ.get("ALLOWED_ORIGINS", "*").split(",")
+                   if origin.strip()]
         self.app.add_middleware(
             CORSMiddleware,
-            allow_origins=["*"],  # Configure appropriately for production
+            allow_origins=origins,
             allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
+            allow_methods=["GET", "POST"],
+            allow_headers=["Content-Type", "Authorization"],
+            max_age=86400,  # browsers reuse a preflight for a day
         )
         
         # Add routes
@@ -306,29 +771,29 @@ class GameAPI:
     def _add_routes(self):
         """Add API routes"""
         
-        @self.app.post("/api/game/start", response_model=GameResponse)
+        # Handlers return ready-made responses; GameResponse is kept for the
+        # OpenAPI schema only
+        @self.app.post("/api/game/start", responses={200: {"model": GameResponse}})
         async def start_game(player_info: PlayerInfo):
             """Start a new game session"""
             try:
                 self.game_logger.player_action("start_game", {"player": player_info.name})
                 
                 # Create session
-                session_id = self.session_manager.create_session(player_info.dict())
+                session_id = self.session_manager.create_session(player_info.model_dump())
+                await self.session_manager.save_session(session_id)
                 session = self.session_manager.get_session(session_id)
                 
                 # Start the game
-                start_response = session["orchestrator"].start_new_game(
+                start_response = await self._run_blocking(
+                    session.orchestrator.start_new_game,
                     player_info.name, player_info.character_class
                 )
                 
-                return GameResponse(
-                    success=True,
-                    game_state=session["context"].game_state.value,
-                    data={
-                        "session_id": session_id,
-                        "game_content": start_response
-                    }
-                )
+                return self._game_response(session.context.game_state.value, {
+                    "session_id": session_id,
+                    "game_content": start_response
+                })
                 
             except Exception as e:
                 self.error_handler.handle_error(
@@ -336,36 +801,39 @@ class GameAPI:
                 )
                 raise HTTPException(status_code=500, detail=str(e))
         
-        @self.app.post("/api/game/{session_id}/action", response_model=GameResponse)
+        @self.app.post("/api/game/{session_id}/action", responses={200: {"model": GameResponse}})
         async def process_action(session_id: str, action: GameAction):
             """Process a player action"""
             try:
-                session = self.session_manager.get_session(session_id)
+                session = await self.session_manager.resolve_session(session_id)
                 if not session:
                     raise HTTPException(status_code=404, detail="Session not found")
                 
+                action_text, action_type = action.action, action.action_type
                 self.game_logger.player_action("game_action", {
                     "session": session_id,
-                    "action": action.action,
-                    "type": action.action_type
+                    "action": action_text,
+                    "type": action_type
                 })
                 
-                # Process the action
-                response = session["orchestrator"].process_player_action(
-                    action.action, action.action_type
-                )
-                
-                # Broadcast update via WebSocket
-                await self.websocket_manager.send_to_session(session_id, {
-                    "type": "action_result",
-                    "data": response
-                })
+                # Only requests overlapping a running action are folded into
+                # it; the same choice made on a later turn is processed anew
+                inflight = self._inflight_actions
+                key = (session_id, action_type, action_text)
+                task = inflight.get(key) if action_type in self.DEDUPED_ACTION_TYPES else None
+                if task is None or task.done():
+                    task = asyncio.ensure_future(
+                        self._apply_action(session_id, session, action_text, action_type)
+                    )
+                    if action_type in self.DEDUPED_ACTION_TYPES:
+                        inflight[key] = task
+                        task.add_done_callback(
+                            lambda done: inflight.pop(key) if inflight.get(key) is done else None
+                        )
                 
-                return GameResponse(
-                    success=True,
-                    game_state=session["context"].game_state.value,
-                    data=response
-                )
+                # Shielded so one client going away doesn't cancel the action
+                # for the others waiting on it
+                return await asyncio.shield(task)
                 
             except Exception as e:
                 self.error_handler.handle_error(
@@ -374,21 +842,27 @@ class GameAPI:
                 )
                 raise HTTPException(status_code=500, detail=str(e))
         
-        @self.app.get("/api/game/{session_id}/status", response_model=GameResponse)
+        @self.app.get("/api/game/{session_id}/status", responses={200: {"model": GameResponse}})
         async def get_game_status(session_id: str):
             """Get current game status"""
             try:
-                session = self.session_manager.get_session(session_id)
+                session = await self.session_manager.resolve_session(session_id)
                 if not session:
                     raise HTTPException(status_code=404, detail="Session not found")
                 
-                status = session["orchestrator"].get_game_status()
+                # Polling clients share one computation per turn for up to
+                # STATUS_TTL, which keeps session_duration close to current
+                response_cache = self.response_cache
+                key = self._cache_key(session_id, session, "status")
+                cached = response_cache.get(key)
+                if cached is not None:
+                    return cached
                 
-                return GameResponse(
-                    success=True,
-                    game_state=session["context"].game_state.value,
-                    data=status
-                )
+                status = await self._run_blocking(session.orchestrator.get_game_status)
+                
+                result = self._game_response(session.context.game_state.value, status)
+                response_cache.set(key, result, ttl=self.STATUS_TTL)
+                return result
                 
             except Exception as e:
                 self.error_handler.handle_error(e, ErrorCategory.SYSTEM_ERROR, ErrorSeverity.LOW)
@@ -397,43 +871,60 @@ class GameAPI:
         @self.app.websocket("/api/ws/{session_id}")
         async def websocket_endpoint(websocket: WebSocket, session_id: str):
             """WebSocket endpoint for real-time communication"""
-            connection_id = await self.websocket_manager.connect(websocket, session_id)
+            websocket_manager = self.websocket_manager
+            session_manager = self.session_manager
+            receive_text, send_text = websocket.receive_text, websocket.send_text
+            connection_id = await websocket_manager.connect(websocket, session_id)
             
             try:
                 while True:
                     # Wait for messages from client
-                    data = await websocket.receive_text()
-                    message = json.loads(data)
+                    data = await receive_text()
+                    if data == _PING_FRAME:
+                        await send_text(_PONG_FRAME)
+                        continue
+                    
+                    message = _json_loads(data)
+                    message_type = message.get("type")
                     
                     # Handle different message types
-                    if message.get("type") == "ping":
-                        await websocket.send_text(json.dumps({"type": "pong"}))
-                    elif message.get("type") == "action":
+                    if message_type == "ping":
+                        await send_text(_PONG_FRAME)
+                    elif message_type == "action":
                         # Process action and broadcast result
-                        session = self.session_manager.get_session(session_id)
+                        session = await session_manager.resolve_session(session_id)
                         if session:
-                            response = session["orchestrator"].process_player_action(
-                                message.get("action", ""), message.get("action_type", "choice")
-                            )
-                            await self.websocket_manager.send_to_session(session_id, {
+                            async with session.action_sem:
+                                response = await self._run_blocking(
+                                    session.orchestrator.process_player_action,
+                                    message.get("action", ""), message.get("action_type", "choice")
+                                )
+                            websocket_manager.enqueue(session_id, {
                                 "type": "action_result",
                                 "data": response
                             })
                     
-            except WebSocketDisconnect:
-                self.websocket_manager.disconnect(connection_id)
+            except WebSocketDisconnect as e:
+                if e.code == 1009:
+                    logger.warning(f"Closed connection {connection_id}: message exceeded ws_max_size")
+                websocket_manager.disconnect(connection_id)
             except Exception as e:
                 logger.error(f"WebSocket error: {e}")
-                self.websocket_manager.disconnect(connection_id)
+                websocket_manager.disconnect(connection_id)
         
         @self.app.get("/api/admin/stats")
         async def get_statistics():
             """Get system statistics (admin endpoint)"""
+            # Dashboards poll this; sweeping every session once a second is enough
+            cached = self.response_cache.get("__stats__")
+            if cached is not None:
+                return cached
+            
             session_stats = self.session_manager.get_session_statistics()
             error_stats = self.error_handler.get_error_statistics()
             performance_stats = self.game_logger.get_performance_stats()
             
-            return {
+            result = {
                 "sessions": session_stats,
                 "errors": error_stats,
                 "performance": performance_stats,
@@ -442,6 +933,30 @@ class GameAPI:
                     "max_size": self.response_cache.max_size
                 }
             }
+            self.response_cache.set("__stats__", result, ttl=self.STATS_TTL)
+            return result
+        
+        @self.app.get("/health")
+        async def health():
+            """Liveness check - stays 200 while a background migration runs"""
+            status = self.migration_runner.status
+            return {
+                "status": {"migrating": "migrating", "failed": "degraded"}.get(status, "ok"),
+                "migration": status
+            }
+        
+        @self.app.get("/health/migration")
+        async def migration_health():
+            """Migration progress with applied and target Alembic revisions"""
+            return await self.migration_runner.get_status()
+        
+        sdk_body = _JS_SDK.encode()
+        
+        @self.app.get("/sdk.js")
+        async def javascript_sdk():
+            """JavaScript client SDK, cacheable by browsers for a day"""
+            return Response(content=sdk_body, media_type="application/javascript",
+                            headers={"Cache-Control": "public, max-age=86400"})
         
         @self.app.get("/")
         async def root():
@@ -455,6 +970,9 @@ class GameAPI:
                     "process_action": "/api/game/{session_id}/action",
                     "get_status": "/api/game/{session_id}/status",
                     "websocket": "/api/ws/{session_id}",
+                    "health": "/health",
+                    "migration": "/health/migration",
+                    "sdk": "/sdk.js",
                     "docs": "/docs"
                 }
             }
@@ -464,17 +982,23 @@ class GameAPI:
         if not self.app:
             raise RuntimeError("FastAPI not available. Please install: pip install fastapi uvicorn")
         
-        logger.info(f"🌐 Starting Magic Adventure Game API on {host}:{port}")
-        uvicorn.run(self.app, host=host, port=port, debug=debug)
+        # uvloop/httptools come with uvicorn[standard]; fall back to the pure
+        # Python implementations where they are unavailable (e.g. Windows)
+        loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+        http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+        
+        logger.info(f"🌐 Starting Magic Adventure Game API on {host}:{port} (loop: {loop}, http: {http})")
+        # Cap frame size and per-connection receive queue so a client can't
+        # exhaust worker memory; oversized frames close the socket with 1009
+        uvicorn.run(self.app, host=host, port=port, loop=loop, http=http, ws="websockets",
+                    ws_max_size=64 * 1024, ws_max_queue=32,
+                    ws_ping_interval=20, ws_ping_timeout=20,
+                    log_level="debug" if debug else "info")
 
 
-class FrontendHelpers:
-    """Helper utilities for frontend integration"""
-    
-    @staticmethod
-    def generate_javascript_sdk() -> str:
-        """Generate JavaScript SDK for frontend integration"""
-        return '''
+# Built once at import; the methods below and the /sdk.js route hand out
+# the same string objects
+_JS_SDK = '''
 class MagicAdventureClient {
     constructor(baseUrl = 'http://localhost:8000') {
         this.baseUrl = baseUrl;
@@ -530,8 +1054,12 @@ class MagicAdventureClient {
         
         this.websocket.onmessage = (event) => {
             const data = JSON.parse(event.data);
-            if (this.eventHandlers[data.type]) {
-                this.eventHandlers[data.type](data);
+            // Updates sent close together arrive as one batch frame
+            const messages = data.type === 'batch' ? data.items : [data];
+            for (const message of messages) {
+                if (this.eventHandlers[message.type]) {
+                    this.eventHandlers[message.type](message);
+                }
             }
         };
         
@@ -548,11 +1076,8 @@ class MagicAdventureClient {
 // await client.startGame('Hero Name');
 // const response = await client.processAction('explore the forest');
 '''
-    
-    @staticmethod
-    def generate_html_demo() -> str:
-        """Generate HTML demo page"""
-        return '''
+
+_HTML_DEMO = '''
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -668,6 +1193,20 @@ class MagicAdventureClient {
 '''
 
 
+class FrontendHelpers:
+    """Helper utilities for frontend integration"""
+    
+    @staticmethod
+    def generate_javascript_sdk() -> str:
+        """Generate JavaScript SDK for frontend integration"""
+        return _JS_SDK
+    
+    @staticmethod
+    def generate_html_demo() -> str:
+        """Generate HTML demo page"""
+        return _HTML_DEMO
+
+
 if __name__ == "__main__":
     # Demo the web integration
     print("🌐 Web Integration Demo")
@@ -705,6 +1244,8 @@ if __name__ == "__main__":
         print("  GET  /api/game/{session_id}/status - Get game status")
         print("  WS   /api/ws/{session_id} - WebSocket connection")
         print("  GET  /api/admin/stats - System statistics")
+        print("  GET  /health/migration - Database migration status")
+        print("  GET  /sdk.js - JavaScript client SDK")
         
         print("\n🎮 To start the server, run:")
         print("  python web_integration.py --serve")